@@ -1,6 +1,8 @@
+import concurrent.futures
 import os
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import xlsxwriter
 
@@ -45,8 +47,11 @@ class ExcelReportGenerator:
         df["operation_date"] = pd.to_datetime(df["operation_date"])
         years = sorted(df["operation_date"].dt.year.unique())
 
-        for year in years:
-            self.__generate_annual_report(account_id, year)
+        # Un classeur indépendant par année : lectures SQLite (une connexion par appel)
+        # et compression des fichiers .xlsx se recouvrent d'une année à l'autre
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(years))) as executor:
+            # list() propage les éventuelles exceptions levées dans les threads
+            list(executor.map(self.__generate_annual_report, [account_id] * len(years), years))
 
     def __generate_annual_report(self, account_id: int, year: int) -> None:
         """Génère le rapport Excel avec colonnes décalées et tri décroissant."""
@@ -57,12 +62,23 @@ class ExcelReportGenerator:
         if not structure:
             return
 
+        # Matrice sous-catégorie x mois calculée en une seule passe
+        monthly_matrix = data_summary.pivot_table(
+            index="sub_category", columns="month_idx", values="amount", aggfunc="sum", fill_value=0.0
+        ).reindex(columns=range(1, 13), fill_value=0.0)
+        # Lignes de la matrice extraites en une fois (listes Python) : la boucle d'écriture
+        # ne refait pas une recherche .loc et une Series par sous-catégorie
+        monthly_rows = dict(zip(monthly_matrix.index, monthly_matrix.to_numpy().tolist()))
+
         file_path = os.path.join(self.__root_path, f"Budget pour {year}.xlsx")
 
         wb = xlsxwriter.Workbook(file_path)
         ws = wb.add_worksheet("BUDGET PERSONNEL")
         fmt = self.__get_excel_formats(wb)
 
+        # Format de chaque colonne mois (alternance bleue sur les mois pairs), résolu une seule fois
+        month_formats = [fmt["currency_blue"] if month_idx % 2 == 0 else fmt["currency"] for month_idx in range(1, 13)]
+
         # Configuration des colonnes (N est vide pour le décalage)
         ws.set_column("A:A", 35)
         ws.set_column("B:M", 12)
@@ -99,11 +115,7 @@ class ExcelReportGenerator:
                 for item in section["items"]:
                     ws.write(row, 0, item, fmt["item_label"])
                     # Mois (B à M)
-                    for month_idx in range(1, 13):
-                        val = data_summary[
-                            (data_summary["sub_category"] == item) & (data_summary["month_idx"] == month_idx)
-                        ]["amount"].sum()
-                        cell_fmt = fmt["currency_blue"] if month_idx % 2 == 0 else fmt["currency"]
+                    for month_idx, (val, cell_fmt) in enumerate(zip(monthly_rows[item], month_formats), 1):
                         ws.write(row, month_idx, val, cell_fmt)
 
                     # Total Annuel décalé en colonne O (indice 14)
@@ -306,10 +318,11 @@ class ExcelReportGenerator:
             return pd.DataFrame(columns=["sub_category", "month_idx", "amount"])
 
         df["operation_date"] = pd.to_datetime(df["operation_date"])
-        df = df[df["operation_date"].dt.year == year].copy()
-        df["month_idx"] = df["operation_date"].dt.month
+        df = df[df["operation_date"].dt.year == year]
 
-        summary = df.groupby(["sub_category", "month_idx"])["amount"].sum().reset_index()
+        # Le mois sert directement de clé de regroupement, sans copier la sélection
+        month_idx = df["operation_date"].dt.month.rename("month_idx")
+        summary = df.groupby(["sub_category", month_idx])["amount"].sum().reset_index()
         summary["amount"] = summary["amount"].abs()
 
         return summary
@@ -324,6 +337,15 @@ class ExcelReportGenerator:
         # Dictionnaire des totaux pour le tri
         annual_totals = data_summary.groupby("sub_category")["amount"].sum().to_dict()
 
+        # Tri unique de toutes les sous-catégories actives par montant décroissant (tri stable),
+        # puis regroupement par catégorie en conservant cet ordre
+        totals = df_sub["sub_category_name"].map(annual_totals).fillna(0).to_numpy(dtype=float)
+        order = np.argsort(-totals, kind="stable")
+        active_order = order[totals[order] > 0]
+        items_by_cat = (
+            df_sub.iloc[active_order].groupby("parent_category", sort=False)["sub_category_name"].agg(list).to_dict()
+        )
+
         full_structure = []
         categories = df_sub["parent_category"].unique()
         recettes_names = self.__db.get_categories_hierarchy()[0].keys()
@@ -337,11 +359,7 @@ class ExcelReportGenerator:
             )
 
             for cat in current_cats:
-                cat_items = df_sub[df_sub["parent_category"] == cat]["sub_category_name"].tolist()
-                active_items = [i for i in cat_items if annual_totals.get(i, 0) > 0]
-
-                # Tri décroissant des items
-                active_items.sort(key=lambda x: annual_totals.get(x, 0), reverse=True)
+                active_items = items_by_cat.get(cat, [])
 
                 if active_items:
                     group_content.append({"type": "sub", "name": cat.upper(), "items": active_items})
@@ -1,14 +1,17 @@
 import json
 import os
 import uuid
+from typing import TYPE_CHECKING
 
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 from config import load_config
 from database.bnp_paribas_database import BnpParibasDatabase
 
+# Plotly n'est importé qu'au moment de tracer un sunburst (coût d'import élevé au démarrage du dashboard)
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 
 class FinancialChart:
     """
@@ -22,10 +25,35 @@ class FinancialChart:
     - Produire des bilans annuels et mensuels en créant et sauvegardant automatiquement les fichiers HTML.
     """
 
+    # Palette des flux Sankey, sérialisée une seule fois pour toutes les injections JS
+    SANKEY_COLORS = (
+        "#544FC5",
+        "#2CAFFE",
+        "#FF7F50",
+        "#32CD32",
+        "#FF69B4",
+        "#FFA500",
+        "#8A2BE2",
+        "#00CED1",
+        "#DC143C",
+        "#7FFF00",
+    )
+    SANKEY_COLORS_JSON = json.dumps(SANKEY_COLORS)
+
+    # Mise en page commune des figures sunburst (seule ou combinées), définie une seule fois
+    SUNBURST_LAYOUT = {
+        "showlegend": True,
+        "width": 1800,
+        "height": 900,
+        "margin": {"l": 200, "r": 100, "t": 50, "b": 50},
+    }
+
     def __init__(self, db: BnpParibasDatabase, account_name: str) -> None:
         self.__db = db
         self.__root_path = os.path.join(load_config()["destination_path"], account_name)
         self.__file_highcharts = []
+        # Bibliothèques Highcharts concaténées, lues une seule fois pour tous les bilans
+        self.__js_bundle = None
 
         os.makedirs(self.__root_path, exist_ok=True)
 
@@ -59,8 +87,12 @@ class FinancialChart:
         if years_data:
             years = sorted(years_data.keys())
             self.__output_file = f"{self.__root_path}/Bilan {years[0]}-{years[-1]}.html"
+            # Une concaténation par liste ; l'index d'origine n'étant pas utilisé par les graphiques,
+            # il n'est pas reconstruit (RangeIndex au lieu d'un index entier matérialisé)
             self.__generate_annual_report(
-                pd.concat(all_years_incomes), pd.concat(all_years_expenses), pd.concat(all_years_combined)
+                pd.concat(all_years_incomes, ignore_index=True),
+                pd.concat(all_years_expenses, ignore_index=True),
+                pd.concat(all_years_combined, ignore_index=True),
             )
 
     # --- [ Production des Bilans ] ---
@@ -107,29 +139,37 @@ class FinancialChart:
         - du HTML brut (str)
         """
 
+        plotly_js_written = False
+
         with open(self.__output_file, "w", encoding="utf-8") as f:
             for item in self.__file_highcharts:
                 if isinstance(item, str):
                     # HTML brut (ex: Highcharts)
                     f.write(item)
                 else:
-                    # Figure Plotly
-                    item.write_html(f, include_plotlyjs="cdn")
+                    # Figure Plotly : simple fragment <div>, le script plotly.js (CDN) n'est émis qu'une fois.
+                    # Les go.Figure sont déjà validées à leur construction : pas de seconde validation ici
+                    item.write_html(
+                        f,
+                        include_plotlyjs=False if plotly_js_written else "cdn",
+                        full_html=False,
+                        validate=False,
+                    )
+                    plotly_js_written = True
 
         # Reset après écriture
         self.__file_highcharts = []
 
     # --- [ Génération de Graphiques ] ---
-    def __create_sankey_chart(self, incomes_expenses_df: pd.DataFrame) -> str:
+    def __create_sankey_chart(self, incomes_expenses_df: pd.DataFrame, category_lists: tuple[list, list]) -> str:
         """
         Génère le code HTML/JavaScript pour un diagramme de Sankey dynamique.
         Utilise la liste des catégories de revenus de la base de données pour
         regrouper les flux vers le nœud central.
         """
 
-        # 1. Récupération dynamique des catégories de revenus
-        # On suppose que self.__db est ton instance de BnpParibasDatabase
-        incomes_categories, _ = self.__db.get_category_lists()
+        # 1. Catégories de revenus (lues une seule fois par __generate_html_file)
+        incomes_categories, _ = category_lists
 
         # Génération d'un ID unique pour éviter les conflits si plusieurs graphiques
         graph_id = "sankey_" + str(uuid.uuid4()).replace("-", "_")
@@ -138,28 +178,25 @@ class FinancialChart:
         years = sorted([int(y) for y in incomes_expenses_df["year"].unique()], reverse=True)
         multiple_years = len(years) > 1
 
-        df_copy = incomes_expenses_df.copy()
-        df_copy["operation_date"] = df_copy["operation_date"].astype(str)
-        df_copy["amount"] = df_copy["amount"].astype(float)
-        df_copy["year"] = df_copy["year"].astype(int)
+        # Le script ne fait que sommer les montants par (année, catégorie, sous-catégorie) :
+        # ces flux sont agrégés ici en une passe (ordre d'apparition conservé), une ligne par flux
+        # est sérialisée au lieu d'une ligne par opération. Les dépenses sont passées en valeur
+        # absolue ligne à ligne avant la somme, comme le faisait le script
+        amounts = incomes_expenses_df["amount"].astype(float)
+        is_income = incomes_expenses_df["category"].isin(incomes_categories)
+        flows = (
+            incomes_expenses_df[["year", "category", "sub_category"]]
+            .assign(amount=amounts.where(is_income, amounts.abs()))
+            .groupby(["year", "category", "sub_category"], sort=False, dropna=False)["amount"]
+            .sum()
+            .reset_index()
+            .astype({"year": int})
+        )
 
-        # Sérialisation pour injection JS
-        data_json = json.dumps(df_copy.to_dict(orient="records"), ensure_ascii=False)
+        # Sérialisation pour injection JS directement par l'encodeur C de pandas (sans liste de dictionnaires)
+        data_json = flows.to_json(orient="records", force_ascii=False)
         incomes_list_json = json.dumps(incomes_categories, ensure_ascii=False)
 
-        colors = [
-            "#544FC5",
-            "#2CAFFE",
-            "#FF7F50",
-            "#32CD32",
-            "#FF69B4",
-            "#FFA500",
-            "#8A2BE2",
-            "#00CED1",
-            "#DC143C",
-            "#7FFF00",
-        ]
-
         html = ""
         if multiple_years:
             html += "<h2>Choisir l'année pour Sankey :</h2>"
@@ -176,7 +213,7 @@ class FinancialChart:
             (function() {{
                 const sankeyData = {data_json};
                 const incomesList = {incomes_list_json}; // Liste dynamique des revenus
-                const sankeyColors = {json.dumps(colors)};
+                const sankeyColors = {self.SANKEY_COLORS_JSON};
                 const sankeyYears = {json.dumps(years)};
                 const containerId = 'sankeyContainer_{graph_id}';
                 const yearSelectId = 'sankeyYearSelect_{graph_id}';
@@ -286,7 +323,7 @@ class FinancialChart:
         """
         return html
 
-    def __create_pie_chart(self, df: pd.DataFrame, name: str, save: bool) -> go.Figure:
+    def __create_pie_chart(self, df: pd.DataFrame, name: str, save: bool) -> "go.Figure":
         """
         Crée un graphique circulaire (sunburst) représentant la répartition des montants par catégorie et sous-catégorie.
 
@@ -299,19 +336,30 @@ class FinancialChart:
             go.Figure : objet figure Plotly contenant le graphique circulaire généré.
         """
 
+        import plotly.graph_objects as go
+
         labels = [name]
         parents = [""]
         values = [df["amount"].sum()]
 
-        for category in df["category"].unique():
+        # Deux agrégations en une passe chacune plutôt qu'un masque booléen par catégorie
+        # et par sous-catégorie ; sort=False conserve l'ordre d'apparition des libellés
+        category_sums = df.groupby("category", sort=False)["amount"].sum()
+        sub_category_sums = df.groupby(["category", "sub_category"], sort=False)["amount"].sum()
+
+        sub_categories_by_category = {}
+        for (category, type_op), amount in sub_category_sums.items():
+            sub_categories_by_category.setdefault(category, []).append((type_op, amount))
+
+        for category, amount in category_sums.items():
             labels.append(category)
             parents.append(name)
-            values.append(df[df["category"] == category]["amount"].sum())
+            values.append(amount)
 
-            for type_op in df[df["category"] == category]["sub_category"].unique():
+            for type_op, sub_amount in sub_categories_by_category[category]:
                 labels.append(type_op)
                 parents.append(category)
-                values.append(df[(df["category"] == category) & (df["sub_category"] == type_op)]["amount"].sum())
+                values.append(sub_amount)
 
         fig = go.Figure(
             go.Sunburst(
@@ -322,17 +370,16 @@ class FinancialChart:
                 textinfo="label+percent entry",
             )
         )
-        fig.update_layout(
-            showlegend=True,
-            width=1800,
-            height=900,
-            margin=dict(l=200, r=100, t=50, b=50),
-        )
+        # Une figure non sauvegardée ne sert qu'à fournir ses traces à la figure combinée :
+        # sa mise en page n'est alors jamais utilisée
         if save:
+            fig.update_layout(**self.SUNBURST_LAYOUT)
             self.__file_highcharts.append(fig)
         return fig
 
-    def __create_incomes_expenses_evolution_chart(self, incomes_expenses_df: pd.DataFrame) -> str:
+    def __create_incomes_expenses_evolution_chart(
+        self, incomes_expenses_df: pd.DataFrame, category_lists: tuple[list, list]
+    ) -> str:
         """
         Génère un tableau de bord interactif Highcharts avec bascule Revenus/Dépenses.
 
@@ -346,35 +393,28 @@ class FinancialChart:
                  les contrôles d'interface (radio, select) et la logique Highcharts.
         """
 
-        incomes_expenses_df["operation_date"] = pd.to_datetime(incomes_expenses_df["operation_date"])
-        incomes_expenses_df["year"] = incomes_expenses_df["operation_date"].dt.year
-        incomes_expenses_df["month"] = incomes_expenses_df["operation_date"].dt.month
-
         years = sorted(incomes_expenses_df["year"].unique().tolist(), reverse=True)
 
         months_labels = ["Jan", "Fév", "Mar", "Avr", "Mai", "Juin", "Juil", "Août", "Sep", "Oct", "Nov", "Déc"]
 
-        incomes_list, expenses_list = self.__db.get_category_lists()
+        incomes_list, expenses_list = category_lists
 
         incomes_df = incomes_expenses_df[incomes_expenses_df["category"].isin(incomes_list)]
         expenses_df = incomes_expenses_df[incomes_expenses_df["category"].isin(expenses_list)]
 
         def build_nested(df):
+            # Totaux mensuels calculés en une seule agrégation, puis répartis par
+            # (catégorie, sous-catégorie) et par année : évite un filtrage du
+            # DataFrame pour chaque combinaison sous-catégorie × année
+            sums = df.groupby(["category", "sub_category", "year", "month"])["amount"].sum().abs()
+
+            monthly_totals = {}
+            for (cat, sub, y, month), amount in zip(sums.index.tolist(), sums.tolist()):
+                monthly_totals.setdefault((cat, sub), {}).setdefault(y, [0.0] * 12)[month - 1] = round(amount, 2)
+
             result = {}
-            for cat, cat_df in df.groupby("category"):
-                result[cat] = {}
-                for sub, sub_df in cat_df.groupby("sub_category"):
-                    result[cat][sub] = {}
-                    for y in sorted(years):
-                        monthly = (
-                            sub_df[sub_df["year"] == y]
-                            .groupby("month")["amount"]
-                            .sum()
-                            .abs()
-                            .reindex(range(1, 13), fill_value=0)
-                            .tolist()
-                        )
-                        result[cat][sub][y] = [round(v, 2) for v in monthly]
+            for (cat, sub), totals in monthly_totals.items():
+                result.setdefault(cat, {})[sub] = {y: totals.get(y, [0.0] * 12) for y in sorted(years)}
             return result
 
         datasets = {
@@ -455,6 +495,7 @@ class FinancialChart:
             let type = "Depenses";
             let mode = "year";
             let gran = "total";
+            let average = 0;
             let chart;
 
             function round(v){{return Math.round((v+Number.EPSILON)*100)/100;}}
@@ -463,13 +504,24 @@ class FinancialChart:
                 return type === "Revenus" ? "#544FC5" : "#2CAFFE";
             }}
 
+            // Palette décomposée une seule fois en composantes RGBA
+            const basePalette = Highcharts.getOptions().colors.map(c => Highcharts.color(c).rgba);
+            const paletteSize = basePalette.length;
+
             function getRandomColor(i){{
-                const colors = Highcharts.getOptions().colors;
-                let base = Highcharts.color(colors[i % colors.length]);
-                return base.brighten((Math.random() - 0.5) * 0.3).get();
+                const [r, g, b, a] = basePalette[i % paletteSize];
+                const shift = Math.round((Math.random() - 0.5) * 0.3 * 255);
+                const clamp = v => Math.min(255, Math.max(0, v + shift));
+                return `rgba(${{clamp(r)}},${{clamp(g)}},${{clamp(b)}},${{a}})`;
             }}
 
+            // Totaux déjà calculés, par type / mode / année : chaque combinaison n'est agrégée qu'une fois
+            const totalsCache = {{}};
+
             function aggregate(selectedYear){{
+                const key = type + "|" + mode + "|" + (mode==="year" ? "" : selectedYear);
+                if(key in totalsCache) return totalsCache[key];
+
                 let result;
                 if(mode==="year"){{
                     result = years.map(y =>
@@ -488,7 +540,8 @@ class FinancialChart:
                         ,0)
                     );
                 }}
-                return result.map(round);
+                totalsCache[key] = result.map(round);
+                return totalsCache[key];
             }}
 
             function pct(values){{
@@ -507,10 +560,9 @@ class FinancialChart:
             function buildSeries(){{
                 const y = parseInt(document.getElementById("year_{graph_id}").value)||years[years.length-1];
                 let series=[];
-                let totals;
+                const totals = aggregate(y);
 
                 if(gran==="total"){{
-                    totals = aggregate(y);
                     series.push({{
                         name:type,
                         data:totals,
@@ -553,18 +605,8 @@ class FinancialChart:
                     }});
                 }}
 
-                totals = aggregate(y);
-                const avg = totals.reduce((a,b)=>a+b,0)/totals.length;
-
-                series.push({{
-                    name:"Moyenne",
-                    data:Array(totals.length).fill(round(avg)),
-                    type:"line",
-                    dashStyle:"Dot",
-                    color:"#ff4d4d",
-                    marker:{{enabled:false}},
-                    showInLegend:false
-                }});
+                // La moyenne est tracée comme une ligne de l'axe, pas comme une série de points constants
+                average = round(totals.reduce((a,b)=>a+b,0)/totals.length);
 
                 if(mode==="year"){{
                     series.push({{
@@ -592,19 +634,30 @@ class FinancialChart:
                 gran = document.querySelector('input[name="gran_{graph_id}"]:checked').value;
 
                 const categories = mode==="year"?years:months;
+                const series = buildSeries();
 
                 chart = Highcharts.chart("chart_{graph_id}",{{
                     chart:{{type:"column"}},
                     title:{{text:"Evolution "+type}},
                     xAxis:{{categories}},
                     yAxis:[
-                        {{title:{{text:"€"}}}},
+                        {{
+                            title:{{text:"€"}},
+                            plotLines:[{{
+                                value:average,
+                                color:"#ff4d4d",
+                                dashStyle:"Dot",
+                                width:2,
+                                zIndex:5,
+                                label:{{text:"Moyenne : "+average+" €",align:"right",style:{{color:"#ff4d4d"}}}}
+                            }}]
+                        }},
                         {{title:{{text:"%"}},opposite:true}}
                     ],
                     plotOptions:{{
                         column:{{stacking:gran==="total"?null:"normal"}}
                     }},
-                    series:buildSeries()
+                    series:series
                 }});
             }}
 
@@ -628,7 +681,7 @@ class FinancialChart:
         </script>
         """
 
-    def __create_combined_charts(self, fig1: go.Figure, fig2: go.Figure, save: bool = True) -> go.Figure:
+    def __create_combined_charts(self, fig1: "go.Figure", fig2: "go.Figure", save: bool = True) -> "go.Figure":
         """
         Combine deux graphiques sunburst côte à côte dans une seule figure.
 
@@ -641,6 +694,8 @@ class FinancialChart:
             go.Figure : objet figure Plotly contenant les deux graphiques combinés.
         """
 
+        from plotly.subplots import make_subplots
+
         fig_combined = make_subplots(rows=1, cols=2, specs=[[{"type": "sunburst"}, {"type": "sunburst"}]])
 
         for trace in fig1.data:
@@ -648,17 +703,14 @@ class FinancialChart:
         for trace in fig2.data:
             fig_combined.add_trace(trace, row=1, col=2)
 
-        fig_combined.update_layout(
-            showlegend=True,
-            width=1800,
-            height=900,
-            margin=dict(l=200, r=100, t=50, b=50),
-        )
+        fig_combined.update_layout(**self.SUNBURST_LAYOUT)
         if save:
             self.__file_highcharts.append(fig_combined)
         return fig_combined
 
-    def __create_incomes_expenses_bar_chart(self, incomes_expenses_df: pd.DataFrame) -> str:
+    def __create_incomes_expenses_bar_chart(
+        self, incomes_expenses_df: pd.DataFrame, category_lists: tuple[list, list]
+    ) -> str:
         """
         Génère un histogramme comparatif empilé (Stacked Bar Chart) pour l'analyse globale.
 
@@ -671,30 +723,25 @@ class FinancialChart:
                  et le graphique Highcharts avec calcul automatique de l'épargne.
         """
 
-        # 1. Récupération des catégories depuis la DB
-        incomes_categories, _ = self.__db.get_category_lists()
-
-        incomes_expenses_df["operation_date"] = pd.to_datetime(incomes_expenses_df["operation_date"])
-        incomes_expenses_df["year"] = incomes_expenses_df["operation_date"].dt.year
-        incomes_expenses_df["month"] = incomes_expenses_df["operation_date"].dt.month
+        # 1. Catégories de revenus (lues une seule fois par __generate_html_file)
+        incomes_categories, _ = category_lists
+
+        # Agrégation mensuelle en une seule passe : une ligne par (catégorie, sous-catégorie, année)
+        monthly_matrix = (
+            incomes_expenses_df.groupby(["category", "sub_category", "year", "month"])["amount"]
+            .sum()
+            .unstack("month", fill_value=0)
+            .reindex(columns=range(1, 13), fill_value=0)
+            .abs()
+            .round(2)
+        )
 
-        # Construction de la structure DATA
+        # Construction de la structure DATA (arrondi déjà appliqué sur toute la matrice)
         data_dict = {}
-        for cat, cat_df in incomes_expenses_df.groupby("category"):
-            data_dict[cat] = {}
-            for sub_cat, sub_df in cat_df.groupby("sub_category"):
-                data_dict[cat][sub_cat] = {}
-                for year, year_df in sub_df.groupby("year"):
-                    monthly = (
-                        year_df.groupby(year_df["operation_date"].dt.month)["amount"]
-                        .sum()
-                        .abs()
-                        .reindex(range(1, 13), fill_value=0)
-                        .tolist()
-                    )
-                    data_dict[cat][sub_cat][int(year)] = [round(m, 2) for m in monthly]
+        for (cat, sub_cat, year), monthly in zip(monthly_matrix.index, monthly_matrix.to_numpy().tolist()):
+            data_dict.setdefault(cat, {}).setdefault(sub_cat, {})[int(year)] = monthly
 
-        json_data = json.dumps(data_dict, indent=2)
+        json_data = json.dumps(data_dict)
         incomes_list_json = json.dumps(incomes_categories, ensure_ascii=False)
 
         return f"""
@@ -722,7 +769,9 @@ class FinancialChart:
 
                 const months = ['Jan','Fév','Mar','Avr','Mai','Juin','Juil','Août','Sep','Oct','Nov','Déc'];
                 function round_amount(v) {{ return Math.round((v + Number.EPSILON) * 100) / 100; }}
-                function isIncome(catName) {{ return incomesList.includes(catName); }}
+                // Recherche en temps constant plutôt qu'un parcours de la liste à chaque appel
+                const incomesSet = new Set(incomesList);
+                function isIncome(catName) {{ return incomesSet.has(catName); }}
 
                 function getAllYears() {{
                     const yearSet = new Set();
@@ -744,9 +793,13 @@ class FinancialChart:
                     let revSeries = [];
 
                     if (detailLevel === 'none') {{
+                        // Partition des catégories faite une fois, et non pour chaque colonne affichée
+                        const expenseCats = Object.keys(DATA).filter(c => !isIncome(c));
+                        const incomeCats = Object.keys(DATA).filter(c => isIncome(c));
+
                         const depData = categories.map((label, idx) => {{
                             const y = (viewMode === 'years') ? label : selectedYear;
-                            return round_amount(Object.keys(DATA).filter(c => !isIncome(c)).reduce((s, c) => {{
+                            return round_amount(expenseCats.reduce((s, c) => {{
                                 return s + Object.values(DATA[c]).reduce((s2, sub) => {{
                                     if (!sub[y]) return s2;
                                     return s2 + (viewMode === 'years' ? sub[y].reduce((a, b) => a + b, 0) : sub[y][idx]);
@@ -756,7 +809,7 @@ class FinancialChart:
 
                         const revData = categories.map((label, idx) => {{
                             const y = (viewMode === 'years') ? label : selectedYear;
-                            return round_amount(Object.keys(DATA).filter(c => isIncome(c)).reduce((s, c) => {{
+                            return round_amount(incomeCats.reduce((s, c) => {{
                                 return s + Object.values(DATA[c]).reduce((s2, sub) => {{
                                     if (!sub[y]) return s2;
                                     return s2 + (viewMode === 'years' ? sub[y].reduce((a, b) => a + b, 0) : sub[y][idx]);
@@ -802,10 +855,15 @@ class FinancialChart:
                         columnSeries = [...depSeries, ...revSeries];
                     }}
 
+                    // Épargne nette calculée directement (toutes les séries sont visibles au rendu),
+                    // au lieu d'une série de zéros corrigée ensuite par un second redessin
+                    const sumStack = (stack, i) => columnSeries.filter(s => s.stack === stack).reduce((s, ser) => s + (ser.data[i] || 0), 0);
+                    const netData = categories.map((_, i) => round_amount(sumStack('revenus', i) - sumStack('depenses', i)));
+
                     // Ajout de la ligne d'épargne (toujours en dernier pour être au-dessus)
                     columnSeries.push({{
                         name:'Épargne nette', type:'line', yAxis:1, color:'#00E272',
-                        data: categories.map(()=>0), lineWidth:2,
+                        data: netData, lineWidth:2,
                         showInLegend: false,
                         marker:{{enabled:true,symbol:'circle',radius:4}},
                         zones:[{{value:0,color:'#FF0000'}},{{color:'#00E272'}}]
@@ -854,7 +912,6 @@ class FinancialChart:
                         chart.xAxis[0].setCategories(data.categories,false);
                         chart.redraw();
                     }}
-                    updateNetSavings();
                 }}
 
                 // --- GESTION DES ÉVÉNEMENTS ---
@@ -880,22 +937,44 @@ class FinancialChart:
             </script>
         """
 
+    def __get_js_bundle(self) -> str:
+        """
+        Renvoie le code des bibliothèques Highcharts à injecter dans chaque bilan.
+
+        Les fichiers sont lus et concaténés au premier appel uniquement, puis réutilisés
+        pour toutes les années (au lieu d'une relecture complète par fichier HTML généré).
+        """
+
+        if self.__js_bundle is None:
+            js_files = [
+                "src/static/js/highcharts.js",
+                "src/static/js/sankey.js",
+                "src/static/js/exporting.js",
+            ]
+            parts = []
+
+            for js_file in js_files:
+                try:
+                    with open(js_file, "r", encoding="utf-8") as f:
+                        parts.append(f"\n/* --- Source: {js_file} --- */\n{f.read()}")
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Erreur de concaténation : {js_file} est manquant.")
+
+            self.__js_bundle = "".join(parts)
+
+        return self.__js_bundle
+
     def __generate_html_file(self, incomes_expenses_df: pd.DataFrame, incomes_or_expenses_empty: bool) -> None:
         """Assemble et compile l'ensemble des visualisations dans un document HTML unique."""
 
-        js_files = [
-            "src/static/js/highcharts.js",
-            "src/static/js/sankey.js",
-            "src/static/js/exporting.js",
-        ]
-        js_content = ""
+        js_content = self.__get_js_bundle()
 
-        for js_file in js_files:
-            try:
-                with open(js_file, "r", encoding="utf-8") as f:
-                    js_content += f"\n/* --- Source: {js_file} --- */\n{f.read()}"
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Erreur de concaténation : {js_file} est manquant.")
+        # Préparation commune à tous les graphiques, faite une seule fois :
+        # conversion des dates, colonnes année/mois et listes de catégories
+        incomes_expenses_df["operation_date"] = pd.to_datetime(incomes_expenses_df["operation_date"])
+        incomes_expenses_df["year"] = incomes_expenses_df["operation_date"].dt.year
+        incomes_expenses_df["month"] = incomes_expenses_df["operation_date"].dt.month
+        category_lists = self.__db.get_category_lists()
 
         html = f"""
             <!DOCTYPE html>
@@ -910,13 +989,13 @@ class FinancialChart:
 
         # On vérifie qu'il y a pas des revenus ou des dépenses pour créer le graphique suivant
         if not incomes_or_expenses_empty:
-            html += self.__create_incomes_expenses_bar_chart(incomes_expenses_df)
+            html += self.__create_incomes_expenses_bar_chart(incomes_expenses_df, category_lists)
 
-        html += self.__create_incomes_expenses_evolution_chart(incomes_expenses_df)
+        html += self.__create_incomes_expenses_evolution_chart(incomes_expenses_df, category_lists)
 
         # On vérifie qu'il y a pas des revenus ou des dépenses pour créer le graphique suivant
         if not incomes_or_expenses_empty:
-            html += self.__create_sankey_chart(incomes_expenses_df)
+            html += self.__create_sankey_chart(incomes_expenses_df, category_lists)
 
         html += "</body></html>"
 
@@ -1,6 +1,7 @@
 import os
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import xlsxwriter
 
@@ -46,33 +47,38 @@ class ExcelReportGenerator(TradeRepublicDatabase):
 
 
     # --- [ Analyse des Plus-values ] ---
-    def __get_capital_gains_data(self) -> pd.DataFrame:
-        """Calcule les plus-values réelles en suivant l'état des stocks d'actions."""
-        df = self._get_transactions_in_eur()
-        df = df.sort_index()  # Tri chronologique obligatoire
+    def __get_capital_gains_data(self, transactions: pd.DataFrame) -> list:
+        """
+        Calcule les plus-values réelles en suivant l'état des stocks d'actions.
+
+        Les ventes sont renvoyées directement sous forme de lignes prêtes pour le tableau Excel
+        (date, ticker, quantité, prix de vente, coût d'achat, frais, plus-value).
+        """
+        df = transactions.sort_index()  # Tri chronologique obligatoire
 
         # Dictionnaires pour suivre l'état par ticker
         stock_quantities = {}  # { 'AAPL': quantité_actuelle }
         invested_amounts = {}  # { 'AAPL': coût_total_du_stock_actuel }
         
+        # Lignes du tableau construites au fil de l'eau, sans DataFrame intermédiaire
         realized_gains = []
 
-        for timestamp, row in df.iterrows():
-            ticker = row['ticker']
-            qty = row['quantity']
-            amount = abs(row['amount'])
-            fees = row['fees']
+        for timestamp, operation, ticker, qty, amount, fees in zip(
+            df.index, df['operation'].tolist(), df['ticker'].tolist(),
+            df['quantity'].tolist(), df['amount'].tolist(), df['fees'].tolist()
+        ):
+            amount = abs(amount)
             
             if ticker not in stock_quantities:
                 stock_quantities[ticker] = 0
                 invested_amounts[ticker] = 0
 
-            if row['operation'] == 'buy':
+            if operation == 'buy':
                 # On ajoute les actions et le prix payé (frais inclus dans l'investissement)
                 stock_quantities[ticker] += qty
                 invested_amounts[ticker] += (amount + fees)
                 
-            elif row['operation'] == 'sell' and stock_quantities[ticker] > 0:
+            elif operation == 'sell' and stock_quantities[ticker] > 0:
                 # Calcul du PRU (Prix de Revient Unitaire) avant la vente
                 pru_unitaire = invested_amounts[ticker] / stock_quantities[ticker]
                 
@@ -83,15 +89,8 @@ class ExcelReportGenerator(TradeRepublicDatabase):
                 # amount ici est l'argent récupéré (V)
                 gain = amount - acquisition_cost - fees
                 
-                realized_gains.append({
-                    'date': timestamp,
-                    'ticker': ticker,
-                    'quantity': qty,
-                    'sell_price': amount,
-                    'cost_basis': acquisition_cost,
-                    'fees': fees,
-                    'net_gain': gain
-                })
+                dt_obj = timestamp.to_pydatetime() if hasattr(timestamp, 'to_pydatetime') else timestamp
+                realized_gains.append([dt_obj, ticker, qty, amount, acquisition_cost, fees, gain])
                 
                 # Mise à jour du stock restant
                 stock_quantities[ticker] -= qty
@@ -102,7 +101,7 @@ class ExcelReportGenerator(TradeRepublicDatabase):
                     stock_quantities[ticker] = 0
                     invested_amounts[ticker] = 0
 
-        return pd.DataFrame(realized_gains)
+        return realized_gains
 
 
     # --- [ Génération du Rapport ] ---
@@ -111,39 +110,28 @@ class ExcelReportGenerator(TradeRepublicDatabase):
         file_path = os.path.join(self.__root_path, "Bilan_Investissements.xlsx")
         os.makedirs(self.__root_path, exist_ok=True)
         
+        # Chargement et conversion uniques des transactions, partagés par toutes les feuilles
+        transactions = self._get_transactions_in_eur()
+
         wb = xlsxwriter.Workbook(file_path)
         fmt = self.__get_formats(wb)
 
-        self.__add_gains_sheet(wb, fmt)
-        self.__add_performance_dividend_sheet(wb, fmt)
-        self.__add_annual_summary_sheet(wb, fmt)
+        self.__add_gains_sheet(wb, fmt, transactions)
+        self.__add_performance_dividend_sheet(wb, fmt, transactions)
+        self.__add_annual_summary_sheet(wb, fmt, transactions)
 
         wb.close()
 
-    def __add_gains_sheet(self, wb, fmt: dict):
+    def __add_gains_sheet(self, wb, fmt: dict, transactions: pd.DataFrame):
         """Ajoute la feuille de détail des plus-values avec un tableau Excel"""
         ws = wb.add_worksheet("Plus-values Réalisées")
-        data = self.__get_capital_gains_data()
+        table_data = self.__get_capital_gains_data(transactions)
 
-        if data.empty:
+        if not table_data:
             ws.write(0, 0, "Aucune vente réalisée", fmt['header'])
             return
 
         headers = ["Date", "Action", "Quantité", "Prix Vente", "Coût Achat", "Frais", "Plus-value"]
-        
-        # Préparation des données pour le tableau
-        table_data = []
-        for _, item in data.iterrows():
-            dt_obj = item['date'].to_pydatetime() if hasattr(item['date'], 'to_pydatetime') else item['date']
-            table_data.append([
-                dt_obj, 
-                item['ticker'], 
-                item['quantity'], 
-                item['sell_price'], 
-                item['cost_basis'], 
-                item['fees'], 
-                item['net_gain']
-            ])
 
         # Définition de la zone du tableau
         last_row = len(table_data)
@@ -157,6 +145,9 @@ class ExcelReportGenerator(TradeRepublicDatabase):
             'style': None
         })
 
+        # Formats conditionnels indexés par le signe du gain : (perte, gain)
+        gain_formats = (fmt['loss'], fmt['gain'])
+
         # On repasse sur les cellules pour appliquer les formats monétaires et conditionnels
         for row_idx in range(1, last_row + 1):
             val_gain = table_data[row_idx-1][6]
@@ -168,19 +159,21 @@ class ExcelReportGenerator(TradeRepublicDatabase):
             ws.write(row_idx, 5, table_data[row_idx-1][5], fmt['currency'])
             
             # Format conditionnel
-            cell_fmt = fmt['gain'] if val_gain >= 0 else fmt['loss']
+            cell_fmt = gain_formats[1] if val_gain >= 0 else gain_formats[0]
             ws.write(row_idx, 6, val_gain, cell_fmt)
 
         ws.set_column('A:G', 16)
 
-    def __add_annual_summary_sheet(self, wb, fmt: dict):
+    def __add_annual_summary_sheet(self, wb, fmt: dict, transactions: pd.DataFrame):
         """Ajoute la feuille de résumé annuel sous forme de tableau Excel"""
         ws = wb.add_worksheet("Synthèse Annuelle")
-        df = self._get_transactions_in_eur()
-        
-        df['year'] = df.index.year
-        df['val_buy'] = df.apply(lambda r: r['amount'] if r['operation'] == 'buy' else 0, axis=1)
-        df['val_sell'] = df.apply(lambda r: r['amount'] if r['operation'] == 'sell' else 0, axis=1)
+        # Montants masqués par type d'opération (vectorisé, sans apply ligne par ligne)
+        operations = transactions['operation']
+        df = transactions.assign(
+            year=transactions.index.year,
+            val_buy=transactions['amount'].where(operations == 'buy', 0),
+            val_sell=transactions['amount'].where(operations == 'sell', 0),
+        )
 
         summary = df.groupby('year').agg(
             investi=('val_buy', 'sum'),
@@ -191,9 +184,13 @@ class ExcelReportGenerator(TradeRepublicDatabase):
         headers = ["Année", "Total Investi", "Total Retiré", "Frais Payés", "Évolution %"]
         
         # Préparation des lignes (on laisse la 5ème colonne vide pour la formule)
-        table_rows = []
-        for _, row in summary.iterrows():
-            table_rows.append([row['year'], row['investi'], row['retire'], row['frais'], 0])
+        table_rows = [
+            [year, investi, retire, frais, 0]
+            for year, investi, retire, frais in zip(
+                summary['year'].tolist(), summary['investi'].tolist(),
+                summary['retire'].tolist(), summary['frais'].tolist()
+            )
+        ]
 
         last_row = len(table_rows)
         
@@ -220,30 +217,46 @@ class ExcelReportGenerator(TradeRepublicDatabase):
 
         ws.set_column('A:E', 18)
 
-    def __add_performance_dividend_sheet(self, wb, fmt: dict):
+    def __add_performance_dividend_sheet(self, wb, fmt: dict, transactions: pd.DataFrame):
         """Ajoute la feuille de performance globale par actif (PRU, Div, Détention)"""
         ws = wb.add_worksheet("Performance & Dividendes")
-        df = self._get_transactions_in_eur()
+        df = transactions
         if df.empty:
             return
 
         performance_list = []
-        tickers = df['ticker'].dropna().unique()
+
+        # Codes entiers par ticker (-1 pour les valeurs manquantes), dans l'ordre d'apparition
+        ticker_codes, tickers = pd.factorize(df['ticker'])
+
+        # Total des dividendes de chaque ticker en une seule passe (bincount sur les codes)
+        # plutôt qu'un filtre du DataFrame par ticker
+        amounts = df['amount'].to_numpy(dtype=float)
+        dividend_rows = (ticker_codes >= 0) & (df['operation'] == 'dividend').to_numpy(dtype=bool) & ~np.isnan(amounts)
+        dividends_by_ticker = np.bincount(
+            ticker_codes[dividend_rows], weights=amounts[dividend_rows], minlength=len(tickers)
+        ).tolist()
+
+        # Un seul tri chronologique (stable) puis découpage par ticker,
+        # au lieu d'un filtre et d'un tri par ticker
+        ticker_groups = dict(iter(df.sort_index(kind='stable').groupby('ticker', sort=False)))
 
         # Logique PRU et Dividendes
-        for ticker in tickers:
-            t_df = df[df['ticker'] == ticker].sort_index()
+        for ticker, total_div in zip(tickers, dividends_by_ticker):
+            t_df = ticker_groups[ticker]
             qty, total_cost, first_date = 0, 0, t_df.index.min()
-            total_div = t_df[t_df['operation'] == 'dividend']['amount'].sum()
 
-            for _, row in t_df.iterrows():
-                if row['operation'] == 'buy':
-                    qty += row['quantity']
-                    total_cost += (row['amount'] + row['fees'])
-                elif row['operation'] == 'sell' and qty > 0:
+            for operation, quantity, amount, fees in zip(
+                t_df['operation'].tolist(), t_df['quantity'].tolist(),
+                t_df['amount'].tolist(), t_df['fees'].tolist()
+            ):
+                if operation == 'buy':
+                    qty += quantity
+                    total_cost += (amount + fees)
+                elif operation == 'sell' and qty > 0:
                     pru_at_time = total_cost / qty
-                    qty -= row['quantity']
-                    total_cost -= (pru_at_time * row['quantity'])
+                    qty -= quantity
+                    total_cost -= (pru_at_time * quantity)
 
             days = (datetime.now() - first_date).days
             pru_final = (total_cost / qty) if qty > 0 else 0
@@ -15,6 +15,14 @@ class PortfolioEngine:
     de risque (Sharpe, Drawdown) et de gestion de trésorerie.
     """
 
+    # Fréquence de rééchantillonnage et facteur d'annualisation par période du ratio de Sharpe
+    # (None : rendements quotidiens, sans rééchantillonnage)
+    SHARPE_PERIODS = {
+        'journalier': (None, 252),
+        'mensuel': ('ME', 12),
+        'annuel': ('YE', 1),
+    }
+
     def __init__(self, start_date: datetime, end_date: datetime):
         """
         Initialise le moteur avec la période d'analyse définie.
@@ -25,6 +33,8 @@ class PortfolioEngine:
         """
         self.__start_date = start_date
         self.__end_date = end_date
+        # Index quotidien de la période, construit une seule fois et partagé par tous les calculs
+        self.__date_range = pd.date_range(start=start_date, end=end_date, freq="D")
 
 
     # --- [ Analyse de Performance ] ---
@@ -41,60 +51,55 @@ class PortfolioEngine:
         Returns:
             - pd.Series : Série mensuelle d'évolution en pourcentage.
         """
-        portfolio_series.index = pd.to_datetime(portfolio_series.index)
-        transactions_df = transactions_df.copy()
-        transactions_df.index = pd.to_datetime(transactions_df.index)
+        portfolio_series.index = PortfolioEngine.__datetime_index(portfolio_series.index)
+        # Seul l'index change : set_axis renvoie un nouvel objet sans dupliquer les colonnes
+        transactions_df = transactions_df.set_axis(PortfolioEngine.__datetime_index(transactions_df.index))
 
-        # Nettoyage des données (suppression des valeurs nulles ou négatives)
-        portfolio_series = portfolio_series[portfolio_series > 0].dropna()
-        monthly_start = portfolio_series.resample("ME").first()
-        monthly_end = portfolio_series.resample("ME").last()
+        # Nettoyage des données (suppression des valeurs nulles ou négatives) ;
+        # les NaN échouent déjà à la comparaison, aucun dropna supplémentaire n'est nécessaire
+        portfolio_series = portfolio_series[portfolio_series > 0]
+        monthly_start, monthly_end = PortfolioEngine.__monthly_first_last(portfolio_series)
         
         has_sales = "sell" in transactions_df["operation"].unique()
 
         if has_sales:
-            monthly_returns = pd.Series(index=monthly_start.index, dtype=float)
-            is_first_month = True
-
-            for date in monthly_start.index:
-                month_start = date.replace(day=1)
-                month_end = month_start + pd.offsets.MonthEnd(0)
-
-                # Extraction des achats nets sur la période
-                buys = transactions_df.loc[
-                    (transactions_df["operation"] == "buy") &
-                    (transactions_df.index >= month_start) &
-                    (transactions_df.index <= month_end)
-                ].copy()
-                
-                # Conversion explicite pour éviter les erreurs de type
-                buys["amount"] = buys["amount"].astype(float)
-                buys["fees"] = buys["fees"].astype(float)
-                
-                monthly_net_buy = (buys["amount"] - buys["fees"]).sum()
-                
-                # Correction pour le tout premier mois si des achats initiaux existent
-                if is_first_month and not buys.empty:
-                    monthly_net_buy -= buys["amount"].iloc[0]
-                    is_first_month = False
-
-                # Extraction des ventes sur la période
-                sells = transactions_df.loc[
-                    (transactions_df["operation"] == "sell") &
-                    (transactions_df.index >= month_start) &
-                    (transactions_df.index <= month_end)
-                ].copy()
-                monthly_net_sell = sells["amount"].astype(float).sum()
-
-                start_val = monthly_start.get(date)
-                end_val = monthly_end.get(date)
-
-                # Calcul du rendement ajusté des flux de trésorerie (performance approximé)
-                if pd.isna(start_val) or (start_val + monthly_net_buy) == 0:
-                    monthly_returns[date] = float("nan")
-                else:
-                    monthly_returns[date] = ((end_val / (start_val + monthly_net_buy - monthly_net_sell)) - 1) * 100
-            return monthly_returns
+            months = monthly_start.index.to_period("M")
+            tx_months = transactions_df.index.to_period("M")
+            operations = transactions_df["operation"]
+
+            # Achats nets agrégés par mois en une seule passe
+            buy_mask = (operations == "buy").to_numpy()
+            buy_amounts = transactions_df.loc[buy_mask, "amount"].astype(float)
+            buy_fees = transactions_df.loc[buy_mask, "fees"].astype(float)
+            buy_months = tx_months[buy_mask]
+            monthly_net_buy = (
+                (buy_amounts - buy_fees).groupby(buy_months).sum().reindex(months, fill_value=0.0).to_numpy(copy=True)
+            )
+
+            # Correction pour le tout premier mois si des achats initiaux existent
+            has_buys = months.isin(buy_months)
+            if has_buys.any():
+                first_month_pos = int(np.argmax(has_buys))
+                first_buys = buy_amounts[~buy_months.duplicated()].set_axis(buy_months.unique())
+                monthly_net_buy[first_month_pos] -= first_buys[months[first_month_pos]]
+
+            # Ventes agrégées par mois
+            sell_mask = (operations == "sell").to_numpy()
+            monthly_net_sell = (
+                transactions_df.loc[sell_mask, "amount"].astype(float)
+                .groupby(tx_months[sell_mask]).sum()
+                .reindex(months, fill_value=0.0)
+                .to_numpy()
+            )
+
+            start_val = monthly_start.to_numpy(dtype=float)
+            end_val = monthly_end.to_numpy(dtype=float)
+
+            # Calcul du rendement ajusté des flux de trésorerie (performance approximé)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = ((end_val / (start_val + monthly_net_buy - monthly_net_sell)) - 1) * 100
+            invalid = np.isnan(start_val) | ((start_val + monthly_net_buy) == 0)
+            return pd.Series(np.where(invalid, np.nan, returns), index=monthly_start.index)
         else:
             # Calcul simple si aucune vente n'a eu lieu
             return ((monthly_end - monthly_start) / monthly_start) * 100
@@ -112,8 +117,10 @@ class PortfolioEngine:
             - pd.DataFrame : DataFrame contenant une colonne 'PercentageChange'.
         """
         assert isinstance(portfolio_pnl_evolution, pd.Series)
-        change = round((((invested_money + portfolio_pnl_evolution) - invested_money) / invested_money) * 100, 2)
-        return pd.DataFrame(change, columns=['PercentageChange'])
+        # ((investi + PnL) - investi) / investi se réduit à PnL / investi :
+        # une seule multiplication par un scalaire sur le tableau NumPy
+        change = np.round(portfolio_pnl_evolution.to_numpy(dtype=float) * (100.0 / invested_money), 2)
+        return pd.DataFrame({'PercentageChange': change}, index=portfolio_pnl_evolution.index)
 
     @staticmethod
     def _capital_gain_losses_composed(tickers_invested: pd.DataFrame, tickers_pru: pd.DataFrame, tickers_prices: pd.DataFrame) -> tuple:
@@ -128,14 +135,18 @@ class PortfolioEngine:
         Returns:
             - tuple : (valuation: pd.DataFrame, gain_pct: pd.DataFrame, gain_abs: pd.DataFrame).
         """
+        # Variation relative par rapport au PRU, calculée une seule fois et partagée
+        # par les trois résultats (moins de matrices intermédiaires)
+        gain_ratio = (tickers_prices - tickers_pru) / tickers_pru
+
         # Calcul du pourcentage de variation par rapport au PRU
-        gain_pct = (tickers_prices - tickers_pru) / tickers_pru * 100
-        
-        # Calcul de la valorisation totale
-        valuation = (tickers_invested * ((gain_pct / 100) + 1))
-        
+        gain_pct = gain_ratio * 100
+
         # Calcul du gain en valeur absolue (Latent)
-        gain_abs = (valuation - tickers_invested)
+        gain_abs = tickers_invested * gain_ratio
+
+        # Calcul de la valorisation totale
+        valuation = tickers_invested + gain_abs
         return valuation, gain_pct, gain_abs
 
     def _calculate_portfolio_cagr(self, valuation: pd.Series, invested: pd.Series, horizons_days=(1, 2, 3, 5, 10)) -> dict:
@@ -151,8 +162,8 @@ class PortfolioEngine:
             - dict : CAGR par horizon temporel (clé 'all' pour la durée totale).
         """
         # Alignement sur la première donnée non nulle
-        val = valuation.loc[valuation.ne(0).idxmax():]
-        inv = invested.loc[invested.ne(0).idxmax():]
+        val = PortfolioEngine.__from_first_activity(valuation)
+        inv = PortfolioEngine.__from_first_activity(invested)
         res = {}
         
         for d in horizons_days:
@@ -180,26 +191,26 @@ class PortfolioEngine:
         Returns:
             - pd.DataFrame : Évolution du cash (colonnes 'cash_flow' et 'cash_cumulative').
         """
-        def __calculate_flow(row):
-            # Détermination du sens du flux de trésorerie selon l'opération
-            op, amt, fee = row['operation'], row['amount'], row['fees']
-            if op == 'buy':
-                return -(amt + fee)
-            elif op == 'sell':
-                return amt - fee
-            elif op in ['deposit', 'dividend', 'interest']:
-                return (amt - fee)
-            elif op == 'withdrawal':
-                return -amt
-            return 0
-
-        transactions_df.index = pd.to_datetime(transactions_df.index)
-        transactions_df['cash_flow'] = transactions_df.apply(__calculate_flow, axis=1)
+        operations = transactions_df['operation'].to_numpy()
+        amounts = transactions_df['amount'].to_numpy(dtype=float)
+        fees = transactions_df['fees'].to_numpy(dtype=float)
+
+        # Détermination du sens du flux de trésorerie selon l'opération
+        transactions_df.index = PortfolioEngine.__datetime_index(transactions_df.index)
+        transactions_df['cash_flow'] = np.select(
+            [
+                operations == 'buy',
+                operations == 'sell',
+                np.isin(operations, ['deposit', 'dividend', 'interest']),
+                operations == 'withdrawal',
+            ],
+            [-(amounts + fees), amounts - fees, amounts - fees, -amounts],
+            default=0.0,
+        )
 
         # Agrégation par date et réindexation sur la période complète
         cash_by_date = transactions_df['cash_flow'].groupby(transactions_df.index).sum()
-        full_index = pd.date_range(start=self.__start_date, end=self.__end_date, freq='D')
-        cash_by_date = cash_by_date.reindex(full_index, fill_value=0)
+        cash_by_date = cash_by_date.reindex(self.__date_range, fill_value=0)
 
         return pd.DataFrame({
             'cash_flow': cash_by_date,
@@ -218,24 +229,33 @@ class PortfolioEngine:
         Returns:
             - float : Montant total net injecté.
         """
-        tx = transactions_df.copy()
-        tx.index = pd.to_datetime(tx.index)
-        tx.sort_index(inplace=True)
+        tx = transactions_df.set_axis(PortfolioEngine.__datetime_index(transactions_df.index))
+        # Les transactions issues de la base sont déjà chronologiques : tri seulement si nécessaire
+        if not tx.index.is_monotonic_increasing:
+            tx = tx.sort_index()
+
+        # Montant investi la veille de chaque transaction sur son ticker, lu en une seule
+        # indexation NumPy (NaN si la date ou le ticker est absent : aucune comparaison ne passe)
+        row_pos = ticker_invested_amounts.index.get_indexer(tx.index - timedelta(days=1))
+        col_pos = ticker_invested_amounts.columns.get_indexer(tx["ticker"])
+        found = (row_pos >= 0) & (col_pos >= 0)
+        prev_invested = np.full(len(tx), np.nan)
+        prev_invested[found] = ticker_invested_amounts.to_numpy(dtype=float)[row_pos[found], col_pos[found]]
 
         available_cash, money_reinvested, invested_cash = 0.0, 0.0, 0.0
 
-        for date, row in tx.iterrows():
-            ticker, amt, fees = row["ticker"], float(row["amount"]), float(row["fees"])
+        for operation, amt, fees, prev_amount in zip(
+            tx["operation"].tolist(), tx["amount"].tolist(), tx["fees"].tolist(), prev_invested.tolist()
+        ):
+            amt, fees = float(amt), float(fees)
             
-            if row["operation"] == "sell":
+            if operation == "sell":
                 # Gestion du réinvestissement vs cash disponible
-                prev_date = date - timedelta(days=1)
-                if ticker in ticker_invested_amounts.columns and prev_date in ticker_invested_amounts.index:
-                    if amt > ticker_invested_amounts.loc[prev_date, ticker]:
-                        money_reinvested += ticker_invested_amounts.loc[prev_date, ticker]
+                if amt > prev_amount:
+                    money_reinvested += prev_amount
                 available_cash += (amt - fees)
             
-            elif row["operation"] == "buy":
+            elif operation == "buy":
                 cost = amt + fees
                 if available_cash >= cost:
                     # Utilisation du cash issu des ventes/dividendes
@@ -261,32 +281,40 @@ class PortfolioEngine:
             - pd.DataFrame : Montants investis quotidiennement par ticker.
         """
         tickers = transaction_df["ticker"].dropna().unique()
-        date_range = pd.date_range(self.__start_date, self.__end_date)
-        invested = pd.DataFrame(0.0, index=date_range, columns=tickers)
-
-        for ticker in tickers:
-            ops = transaction_df[
-                (transaction_df["ticker"] == ticker) & 
-                (transaction_df["operation"].isin(["buy", "sell"]))
-            ]
-            qty_tracker = 0
-
-            # Itération sur chaque transaction pour mettre à jour l'encours
-            for date, data in ops.iterrows():
-                if data["operation"] == "buy":
-                    invested.loc[date:, ticker] += data["amount"]
-                    qty_tracker += data["quantity"]
-                elif data["operation"] == "sell":
-                    if round(qty_tracker, 6) > round(data["quantity"], 6):
-                        # Vente partielle : réduction proportionnelle
-                        new_amt = invested.loc[date, ticker] - data["amount"]
-                        invested.loc[date:, ticker] = max(new_amt, 0.0)
-                        qty_tracker -= data["quantity"]
-                    else:
-                        # Vente totale
-                        invested.loc[date:, ticker] = 0.0
-                        qty_tracker = 0
-        return invested
+
+        trades = transaction_df[transaction_df["operation"].isin(["buy", "sell"])]
+        operations = trades["operation"].tolist()
+        amounts = trades["amount"].tolist()
+        quantities = trades["quantity"].tolist()
+        deltas = np.zeros(len(trades))
+
+        for positions in trades.groupby("ticker", sort=False).indices.values():
+            qty_tracker, current_amt = 0.0, 0.0
+
+            # Variation de l'encours induite par chaque transaction du ticker
+            for i in positions:
+                operation, amount, quantity = operations[i], amounts[i], quantities[i]
+                previous_amt = current_amt
+                if operation == "buy":
+                    current_amt += amount
+                    qty_tracker += quantity
+                elif round(qty_tracker, 6) > round(quantity, 6):
+                    # Vente partielle : réduction proportionnelle
+                    current_amt = max(current_amt - amount, 0.0)
+                    qty_tracker -= quantity
+                else:
+                    # Vente totale
+                    current_amt, qty_tracker = 0.0, 0
+                deltas[i] = current_amt - previous_amt
+
+        # Agrégation journalière par ticker puis un seul cumul sur toute la matrice
+        daily_deltas = (
+            pd.Series(deltas, index=trades.index)
+            .groupby([trades.index, trades["ticker"].to_numpy()])
+            .sum()
+            .unstack(fill_value=0.0)
+        )
+        return daily_deltas.reindex(index=self.__date_range, columns=tickers, fill_value=0.0).cumsum()
 
     def _compute_plus_value_evolution(self, transactions_df: pd.DataFrame, ticker_invested_amounts: pd.DataFrame) -> pd.DataFrame:
         """
@@ -299,27 +327,27 @@ class PortfolioEngine:
         Returns:
             - pd.DataFrame : Flux et cumul de plus-value.
         """
-        def __calc_pv(row):
-            if row['operation'] == 'sell':
-                prev_date = row.name - timedelta(days=1)
-                ticker = row['ticker']
-                if ticker in ticker_invested_amounts.columns and prev_date in ticker_invested_amounts.index:
-                    return row['amount'] - ticker_invested_amounts.loc[prev_date, ticker]
-            return 0
+        transactions_df.index = PortfolioEngine.__datetime_index(transactions_df.index)
+        flows = np.zeros(len(transactions_df))
 
-        transactions_df.index = pd.to_datetime(transactions_df.index)
-        transactions_df['plus_value_flow'] = transactions_df.apply(__calc_pv, axis=1)
+        # Positions de la veille et du ticker dans la matrice des montants investis
+        row_pos = ticker_invested_amounts.index.get_indexer(transactions_df.index - timedelta(days=1))
+        col_pos = ticker_invested_amounts.columns.get_indexer(transactions_df['ticker'])
+        is_sell = (transactions_df['operation'] == 'sell').to_numpy() & (row_pos >= 0) & (col_pos >= 0)
+
+        invested = ticker_invested_amounts.to_numpy(dtype=float)
+        amounts = transactions_df['amount'].to_numpy(dtype=float)
+        flows[is_sell] = amounts[is_sell] - invested[row_pos[is_sell], col_pos[is_sell]]
+        transactions_df['plus_value_flow'] = flows
 
         pv_by_date = transactions_df['plus_value_flow'].groupby(transactions_df.index).sum()
-        full_index = pd.date_range(start=self.__start_date, end=self.__end_date, freq='D')
+        full_index = self.__date_range
         pv_by_date = pv_by_date.reindex(full_index, fill_value=0)
 
-        # Calcul du cumul avec un plancher à zéro
-        pv_cumulative = []
-        current_sum = 0
-        for val in pv_by_date:
-            current_sum = max(current_sum + val, 0)
-            pv_cumulative.append(current_sum)
+        # Calcul du cumul avec un plancher à zéro, sans boucle Python :
+        # S(t) = C(t) - min(0, min(C(0..t))) où C est la somme cumulée brute
+        cumulative = pv_by_date.to_numpy(dtype=float).cumsum()
+        pv_cumulative = cumulative - np.minimum(np.minimum.accumulate(cumulative), 0.0)
 
         return pd.DataFrame({'plus_value_flow': pv_by_date.values, 'plus_value_cumulative': pv_cumulative}, index=full_index)
 
@@ -338,16 +366,16 @@ class PortfolioEngine:
         Returns:
             - float : Ratio de Sharpe arrondi.
         """
-        val = valuation.loc[valuation.ne(0).idxmax():]
-        if periods == 'journalier':
-            rets, scale = val.pct_change().dropna(), 252
-        elif periods == 'mensuel':
-            rets, scale = val.resample('ME').ffill().pct_change().dropna(), 12
-        else:
-            rets, scale = val.resample('YE').ffill().pct_change().dropna(), 1
-        
+        val = PortfolioEngine.__from_first_activity(valuation)
+        # Toute période inconnue est traitée comme annuelle
+        rule, scale = PortfolioEngine.SHARPE_PERIODS.get(periods, PortfolioEngine.SHARPE_PERIODS['annuel'])
+        if rule is not None:
+            val = val.resample(rule).ffill()
+        rets = PortfolioEngine.__returns(val)
+        rets = rets[~np.isnan(rets)]
+
         ann_ret = rets.mean() * scale
-        ann_vol = rets.std() * (scale ** 0.5)
+        ann_vol = rets.std(ddof=1) * (scale ** 0.5)
         return round((ann_ret - risk_free_rate) / ann_vol, 2)
 
     @staticmethod
@@ -363,16 +391,16 @@ class PortfolioEngine:
         Returns:
             - float : Ratio de Sortino ou NaN si données insuffisantes.
         """
-        val = valuation.loc[valuation.ne(0).idxmax():]
-        rets = val.pct_change().dropna()
-        if rets.empty:
+        rets = PortfolioEngine.__returns(PortfolioEngine.__from_first_activity(valuation))
+        rets = rets[~np.isnan(rets)]
+        if rets.size == 0:
             return np.nan
         
         rf_p = (1 + risk_free_rate) ** (1 / periods_per_year) - 1
         excess = rets - rf_p
         neg = excess[excess < 0]
         
-        if neg.empty:
+        if neg.size == 0:
             return np.nan
         
         dd_dev = np.sqrt(np.mean(neg ** 2))
@@ -381,8 +409,9 @@ class PortfolioEngine:
     @staticmethod
     def _calculate_ecart_type(valuation_series: pd.Series) -> float:
         """Calcule la volatilité historique (écart-type) des rendements quotidiens"""
-        val = valuation_series.loc[valuation_series.ne(0).idxmax():]
-        return round(val.pct_change().dropna().std() * 100, 2)
+        rets = PortfolioEngine.__returns(PortfolioEngine.__from_first_activity(valuation_series))
+        rets = rets[~np.isnan(rets)]
+        return round(float(rets.std(ddof=1)) * 100, 2)
     
     @staticmethod
     def _calculer_drawdown_max(valuation: pd.Series) -> dict:
@@ -395,14 +424,18 @@ class PortfolioEngine:
         Returns:
             - dict : Dictionnaire contenant la perte max, la date du pic et la date du creux.
         """
-        val = valuation.loc[valuation.ne(0).idxmax():].dropna()
-        peak = val.cummax()
-        dd = (val / peak - 1.0) * 100
-        
-        dd_max = dd.min()
-        date_dd = dd.idxmin()
-        peak_date = val.loc[:date_dd][val.loc[:date_dd] == peak.loc[date_dd]].index[-1]
-        
+        val = PortfolioEngine.__from_first_activity(valuation).dropna()
+        values = val.to_numpy(dtype=float)
+        peak = np.maximum.accumulate(values)
+        dd = (values / peak - 1.0) * 100
+
+        # Positions entières : le creux par argmin, le pic comme dernière occurrence
+        # du sommet courant avant ce creux (pas de sous-série ni de masque pandas)
+        dd_pos = int(np.nanargmin(dd))
+        dd_max = dd[dd_pos]
+        date_dd = val.index[dd_pos]
+        peak_date = val.index[np.flatnonzero(values[:dd_pos + 1] == peak[dd_pos])[-1]]
+
         return {
             "drawdown_max": round(dd_max, 2), 
             "date_max_before_drawdown": peak_date.date(), 
@@ -420,14 +453,15 @@ class PortfolioEngine:
         Returns:
             - list : [perte maximale en %, date de l'événement].
         """
-        val = valuation_series.loc[valuation_series.ne(0).idxmax():]
-        returns = val.pct_change().dropna()
+        val = PortfolioEngine.__from_first_activity(valuation_series)
+        returns = PortfolioEngine.__returns(val)
         
-        if returns.empty:
+        if np.isnan(returns).all():
             return [np.nan, None]
 
-        # Recherche du rendement minimum journalier
-        return [round(float(returns.min() * 100), 2), returns.idxmin()]
+        # Recherche du rendement minimum journalier (le rendement i correspond à la date i + 1)
+        worst = int(np.nanargmin(returns))
+        return [round(float(returns[worst] * 100), 2), val.index[worst + 1]]
 
 
     # --- [ Gestion des Revenus & Frais ] ---
@@ -441,8 +475,7 @@ class PortfolioEngine:
         Returns:
             - pd.DataFrame : Évolution des frais (colonnes 'daily_fees', 'cumulative_fees').
         """
-        date_range = pd.date_range(start=self.__start_date, end=self.__end_date, freq='D')
-        daily_fees = transactions_df['fees'].resample('D').sum().reindex(date_range, fill_value=0.0)
+        daily_fees = transactions_df['fees'].resample('D').sum().reindex(self.__date_range, fill_value=0.0)
         
         fees_df = daily_fees.to_frame(name='daily_fees')
         fees_df['cumulative_fees'] = fees_df['daily_fees'].cumsum()
@@ -459,26 +492,28 @@ class PortfolioEngine:
         Returns:
             - pd.DataFrame : Historique quotidien du PRU par ticker.
         """
-        buys = transaction_df[transaction_df["operation"] == "buy"].copy()
-        date_range = pd.date_range(self.__start_date, self.__end_date, freq="D")
+        buys = transaction_df[transaction_df["operation"] == "buy"]
         tickers = buys["ticker"].unique()
 
-        invested = pd.DataFrame(0.0, index=date_range, columns=tickers)
-        qty = pd.DataFrame(0.0, index=date_range, columns=tickers)
+        # Montants et montants pondérés par le prix, agrégés par (date, ticker) en une seule passe
+        daily = (
+            buys.assign(weighted=buys["amount"] * buys["stock_price"])
+            .groupby([buys.index, "ticker"])[["amount", "weighted"]]
+            .sum()
+        )
+        # Calcul du prix moyen pondéré puis de la quantité équivalente achetée
+        avg_px = daily["weighted"] / daily["amount"]
+        daily_qty = daily["amount"] / avg_px
 
-        for (ticker, date), grp in buys.groupby(["ticker", buys.index]):
-            amt = grp["amount"].sum()
-            # Calcul du prix moyen pondéré
-            avg_px = (grp["amount"] * grp["stock_price"]).sum() / amt
-            invested.at[date, ticker] += amt
-            qty.at[date, ticker] += amt / avg_px
+        invested = daily["amount"].unstack(fill_value=0.0).reindex(index=self.__date_range, columns=tickers, fill_value=0.0)
+        qty = daily_qty.unstack(fill_value=0.0).reindex(index=self.__date_range, columns=tickers, fill_value=0.0)
 
         pru = (invested.cumsum() / qty.cumsum()).ffill()
         pru = pru.reindex_like(tickers_invested_amounts)
         
-        # Nettoyage des valeurs si aucun montant n'est investi
-        pru[tickers_invested_amounts == 0] = np.nan
-        return pru
+        # Nettoyage des valeurs si aucun montant n'est investi (sélection directe sur les tableaux NumPy)
+        pru_values = np.where(tickers_invested_amounts.to_numpy() == 0, np.nan, pru.to_numpy(dtype=float))
+        return pd.DataFrame(pru_values, index=pru.index, columns=pru.columns)
 
     def _calculate_dividends(self, transactions: pd.DataFrame) -> pd.DataFrame:
         """
@@ -490,19 +525,21 @@ class PortfolioEngine:
         Returns:
             - pd.DataFrame : Matrice quotidienne des dividendes nets par actif.
         """
-        dividends_df = transactions[transactions["operation"] == "dividend"].copy()
-        dividends_df.index = pd.to_datetime(dividends_df.index)
+        dividends_df = transactions[(transactions["operation"] == "dividend") & transactions["ticker"].notna()]
 
-        tickers = dividends_df["ticker"].dropna().unique()
-        date_range = pd.date_range(start=self.__start_date, end=self.__end_date)
-        cash_amount = pd.DataFrame(0.0, index=date_range, columns=tickers)
+        tickers = dividends_df["ticker"].unique()
+        date_range = self.__date_range
 
-        for date, row in dividends_df.iterrows():
-            ticker = row["ticker"]
-            # Calcul du net : Montant brut - Frais
-            amount = float(row["amount"]) - float(row.get("fees", 0.0))
-            if pd.notna(ticker) and date in cash_amount.index:
-                cash_amount.at[date, ticker] += amount
+        if dividends_df.empty:
+            return pd.DataFrame(0.0, index=date_range, columns=tickers)
+
+        # Calcul du net : Montant brut - Frais, agrégé par date et par ticker en une seule passe
+        net_amounts = dividends_df["amount"].astype(float) - dividends_df["fees"].astype(float)
+        cash_amount = (
+            net_amounts.groupby([pd.to_datetime(dividends_df.index), dividends_df["ticker"].to_numpy()]).sum()
+            .unstack(fill_value=0.0)
+            .reindex(index=date_range, columns=tickers, fill_value=0.0)
+        )
 
         return cash_amount
 
@@ -524,14 +561,12 @@ class PortfolioEngine:
         if raw_divs.empty:
             return pd.DataFrame(0.0, index=portfolio_valuation.index, columns=tickers)
 
-        results = pd.DataFrame(0.0, index=portfolio_valuation.index, columns=tickers)
-        for date in raw_divs.index:
-            for ticker in raw_divs.columns:
-                div = raw_divs.at[date, ticker]
-                if pd.notna(div) and date in results.index:
-                    # Pondération par le ratio de valorisation
-                    results.at[date, ticker] += div * (portfolio_valuation.at[date, ticker] / tickers_prices.at[date, ticker])
-        return results
+        # Alignement des dividendes sur les dates et tickers de la valorisation
+        divs = raw_divs.reindex(index=portfolio_valuation.index, columns=tickers)
+
+        # Pondération par le ratio de valorisation, appliquée sur toute la matrice en une fois
+        ratio = portfolio_valuation / tickers_prices.reindex(index=portfolio_valuation.index, columns=tickers)
+        return (divs * ratio).where(divs.notna(), 0.0)
 
     @staticmethod
     def _calculate_dividend_earn(transactions: pd.DataFrame) -> float:
@@ -551,9 +586,81 @@ class PortfolioEngine:
         Returns:
             - float : Rendement du dividende en pourcentage.
         """
-        divs = transactions_df[transactions_df["operation"] == "dividend"]
-        total_income = (divs["amount"] - divs["fees"]).sum()
+        # Seules les colonnes utiles sont lues, sans extraire une copie filtrée de tout le DataFrame
+        total_income = PortfolioEngine._calculate_dividend_earn(transactions_df)
         
         # Division par la dernière valeur connue du portefeuille
-        return round((total_income / final_valuation_series.iloc[-1]) * 100, 2)
+        return round((total_income / PortfolioEngine.__last_valid(final_valuation_series)) * 100, 2)
+
+    # --- [ Utilitaires ] ---
+    @staticmethod
+    def __returns(series: pd.Series) -> np.ndarray:
+        """
+        Rendements simples successifs d'une série, calculés sur le tableau NumPy.
+
+        Équivalent de pct_change() sans remplissage : les NaN (valeurs manquantes
+        ou 0/0) sont conservés et filtrés par l'appelant selon son besoin.
+        """
+        values = series.to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return values[1:] / values[:-1] - 1
+
+    @staticmethod
+    def __datetime_index(index: pd.Index) -> pd.DatetimeIndex:
+        """Convertit un index en DatetimeIndex, sans reconstruire celui qui l'est déjà"""
+        return index if isinstance(index, pd.DatetimeIndex) else pd.to_datetime(index)
+
+    @staticmethod
+    def __from_first_activity(series: pd.Series) -> pd.Series:
+        """
+        Tronque une série avant sa première valeur non nulle.
+
+        La position est obtenue par un unique argmax sur le tableau NumPy,
+        sans construire de masque booléen pandas ni repasser par une recherche
+        d'étiquette. Une série entièrement nulle est renvoyée intacte.
+        """
+        return series.iloc[int(np.argmax(series.to_numpy() != 0)):]
+
+    @staticmethod
+    def __last_valid(series: pd.Series) -> float:
+        """
+        Dernière valeur non manquante d'une série (NaN si elle n'en contient aucune).
+
+        Lecture directe sur le tableau NumPy, sans ffill ni copie de la série.
+        """
+        values = series.to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(values))
+        return values[valid[-1]] if valid.size else np.nan
+
+    @staticmethod
+    def __monthly_first_last(series: pd.Series) -> tuple:
+        """
+        Équivalent de resample("ME").first() / .last() sur une série triée par date.
+
+        Les bornes de chaque mois sont obtenues en une passe par np.unique sur les
+        identifiants de mois, puis les valeurs sont lues par indexation NumPy.
+        Les mois sans donnée restent à NaN, comme avec resample.
+
+        Returns:
+            - tuple : (premières valeurs, dernières valeurs), indexées par fin de mois.
+        """
+        if series.empty:
+            empty = series.resample("ME").first()
+            return empty, empty.copy()
+
+        values = series.to_numpy(dtype=float)
+        month_ids = series.index.to_numpy().astype("datetime64[M]")
+        months, starts = np.unique(month_ids, return_index=True)
+        ends = np.append(starts[1:] - 1, len(values) - 1)
+
+        month_index = pd.date_range(
+            start=series.index[0], end=series.index[-1] + pd.offsets.MonthEnd(0), freq="ME", name=series.index.name
+        )
+        positions = (months - months[0]).astype(int)
+
+        first = np.full(len(month_index), np.nan)
+        last = np.full(len(month_index), np.nan)
+        first[positions] = values[starts]
+        last[positions] = values[ends]
 
+        return pd.Series(first, index=month_index), pd.Series(last, index=month_index)
@@ -1,3 +1,6 @@
+import concurrent.futures
+
+import numpy as np
 import pandas as pd
 
 from bank_accounts.trade_republic.portfolio_engine import PortfolioEngine
@@ -32,6 +35,7 @@ class PortfolioPerformance(TradeRepublicDatabase):
         self.__tickers_open_prices = self._get_all_tickers_opening_prices_df()
         self.__start_date = self._get_first_transaction_date()
         self.__end_date = pd.to_datetime(self.__tickers_open_prices.index[-1])
+        self.__full_date_range = pd.date_range(start=self.__start_date, end=self.__end_date, freq='D')
         self.__portfolio_engine = PortfolioEngine(self.__start_date, self.__end_date)
         self.__portfolio_name = 'Mes Portefeuilles'
 
@@ -48,7 +52,7 @@ class PortfolioPerformance(TradeRepublicDatabase):
         performances_tickers_eur = self.__init_tickers_structure()
         currencies_tickers = self._get_tickers_grouped_by_currency_transaction()
 
-        # Traitement séquentiel par devise pour la conversion et le calcul
+        # Traitement par devise pour la conversion et le calcul
         transactions_not_empty = self.__process_currencies(currencies_tickers, performances_tickers_eur)
 
         # Calcul final et rendu graphique si des transactions ont été traitées
@@ -66,9 +70,9 @@ class PortfolioPerformance(TradeRepublicDatabase):
         Args:
             performances_tickers_eur (dict): Dictionnaire consolidé des performances par ticker en EUR.
         """
-        portfolio_valuation = performances_tickers_eur["tickers_valuation"][self.__portfolio_name].sum(axis=1)
-        portfolio_invested_amounts = performances_tickers_eur["tickers_invested_amounts"][self.__portfolio_name].sum(axis=1)
-        portfolio_dividends = performances_tickers_eur["tickers_dividends"][self.__portfolio_name].sum(axis=1)
+        portfolio_valuation = self.__total_by_date(performances_tickers_eur["tickers_valuation"][self.__portfolio_name])
+        portfolio_invested_amounts = self.__total_by_date(performances_tickers_eur["tickers_invested_amounts"][self.__portfolio_name])
+        portfolio_dividends = self.__total_by_date(performances_tickers_eur["tickers_dividends"][self.__portfolio_name])
 
         transactions_eur = self._get_transactions_in_eur()
 
@@ -78,12 +82,10 @@ class PortfolioPerformance(TradeRepublicDatabase):
         )["plus_value_cumulative"]
 
         # Le gain total combine les gains latents des tickers et les plus-values déjà réalisées
-        portfolio_gain = performances_tickers_eur["tickers_gain"][self.__portfolio_name].sum(axis=1) + portfolio_realized_gains_losses
+        portfolio_gain = self.__total_by_date(performances_tickers_eur["tickers_gain"][self.__portfolio_name]) + portfolio_realized_gains_losses
 
         # Calcul du capital réellement investi net des plus-values réalisées
-        invested_money = (
-            performances_tickers_eur["tickers_invested_amounts"][self.__portfolio_name].sum(axis=1).iloc[-1] - portfolio_realized_gains_losses.iloc[-1]
-        )
+        invested_money = portfolio_invested_amounts.iloc[-1] - portfolio_realized_gains_losses.iloc[-1]
 
         # Calcul du pourcentage de gain global
         portfolio_gain_pct = self.__portfolio_engine._calculate_portfolio_percentage_change(portfolio_gain, invested_money)
@@ -130,12 +132,26 @@ class PortfolioPerformance(TradeRepublicDatabase):
                         self.__portfolio_name
                     )
 
+    @staticmethod
+    def __total_by_date(tickers_df: pd.DataFrame) -> pd.Series:
+        """
+        Additionne les colonnes (tickers) d'une matrice de performance pour chaque date.
+        Les valeurs manquantes sont ignorées, comme avec DataFrame.sum(axis=1).
+
+        Args:
+            tickers_df (pd.DataFrame): Matrice date x ticker.
+
+        Returns:
+            pd.Series: Total du portefeuille par date.
+        """
+        return pd.Series(np.nansum(tickers_df.to_numpy(dtype=float), axis=1), index=tickers_df.index)
+
     def __process_currencies(self, currencies_tickers: dict, performances_tickers_eur: dict) -> bool:
         """
-        Traite séquentiellement toutes les devises présentes dans le portefeuille.
+        Traite toutes les devises présentes dans le portefeuille.
 
-        Parcourt le dictionnaire des tickers groupés par devise, récupère les transactions 
-        correspondantes et lance le calcul des performances si des données sont disponibles. 
+        Récupère en parallèle les transactions de chaque devise (lectures indépendantes), 
+        puis lance séquentiellement le calcul des performances si des données sont disponibles. 
         Retourne un indicateur signalant si au moins une transaction a été traitée.
 
         Args:
@@ -147,10 +163,16 @@ class PortfolioPerformance(TradeRepublicDatabase):
         """
         transactions_not_empty = False
 
-        for currency, tickers in currencies_tickers.items():
-            # Récupération de l'historique des transactions pour la devise actuelle
-            transactions = self._get_transactions_by_currency(currency)
+        if not currencies_tickers:
+            return transactions_not_empty
 
+        # Récupération concurrente de l'historique des transactions de chaque devise
+        # Chaque appel ouvre sa propre connexion SQLite, les lectures sont donc indépendantes
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(currencies_tickers)) as executor:
+            transactions_by_currency = list(executor.map(self._get_transactions_by_currency, currencies_tickers))
+
+        # Traitement séquentiel : les calculs alimentent des structures partagées
+        for (currency, tickers), transactions in zip(currencies_tickers.items(), transactions_by_currency):
             # Si des transactions existent, on déclenche le traitement et le calcul des indicateurs
             if not transactions.empty:
                 transactions_not_empty = True
@@ -255,13 +277,21 @@ class PortfolioPerformance(TradeRepublicDatabase):
             existing_data = all_performance[key].get(self.__portfolio_name)
 
             if isinstance(existing_data, pd.DataFrame) and not existing_data.empty:
-                # On utilise combine_first ou concat avec une gestion d'index.
-                # 'combine_first' est idéal ici : il met à jour les valeurs existantes,
-                # ajoute les nouvelles colonnes (tickers) et les nouvelles lignes (dates).
-                
-                # On s'assure d'abord que les deux sont bien alignés temporellement si nécessaire
-                updated_df = existing_data.combine_first(new_df)
-                all_performance[key][self.__portfolio_name] = updated_df
+                shares_index = existing_data.index.equals(new_df.index)
+                disjoint_tickers = existing_data.columns.intersection(new_df.columns).empty
+
+                if shares_index and disjoint_tickers:
+                    # Cas courant (une devise = des tickers distincts sur la même période) :
+                    # ajout direct des nouvelles colonnes, sans réalignement des index
+                    updated_df = pd.concat([existing_data, new_df], axis=1)
+                else:
+                    # 'combine_first' met à jour les valeurs existantes,
+                    # ajoute les nouvelles colonnes (tickers) et les nouvelles lignes (dates).
+                    updated_df = existing_data.combine_first(new_df)
+
+                # Ordre des colonnes (tickers) identique quelle que soit la branche suivie :
+                # il se retrouve dans les tables de performance et les graphiques
+                all_performance[key][self.__portfolio_name] = updated_df.sort_index(axis=1)
             else:
                 # Premier enregistrement pour ce portefeuille
                 all_performance[key][self.__portfolio_name] = new_df
@@ -290,16 +320,15 @@ class PortfolioPerformance(TradeRepublicDatabase):
         # Conversion des prix dans la devise cible via la méthode dédiée
         open_prices_converted = self._convert_dataframe_to_currency(open_prices, currency)
 
-        # Restriction à la date de début et création d'un index quotidien complet
+        # Restriction à la date de début (l'index quotidien complet est construit une seule fois)
         open_prices_filtered = open_prices_converted.loc[self.__start_date:]
-        full_date_range = pd.date_range(
-            start=self.__start_date, 
-            end=self.__end_date, 
-            freq='D'
-        )
-
-        # Réindexation pour combler les trous (week-ends) et propagation des valeurs
-        return open_prices_filtered.reindex(full_date_range).ffill().bfill()
+
+        # Réindexation pour combler les trous (week-ends) puis propagation des valeurs
+        # directement sur ce nouveau DataFrame, sans copie intermédiaire par étape
+        open_prices_daily = open_prices_filtered.reindex(self.__full_date_range)
+        open_prices_daily.ffill(inplace=True)
+        open_prices_daily.bfill(inplace=True)
+        return open_prices_daily
     
     def __init_performance_structure(self) -> dict:
         """Initialise la structure des performances du portefeuille."""
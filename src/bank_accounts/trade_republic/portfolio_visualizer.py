@@ -12,6 +12,9 @@ class PortfolioVisualizer(TradeRepublicDatabase):
     basés sur les données de performance du portefeuille.
     """
 
+    # Nombre maximal de points transmis par série (environ un point par 2 pixels de graphique)
+    MAX_POINTS_PER_SERIES = 1000
+
     def __init__(self, db_path: str, root_path: str):
         """
         Initialise le visualiseur et prépare l'environnement de sortie.
@@ -65,14 +68,50 @@ class PortfolioVisualizer(TradeRepublicDatabase):
                (df['ticker'] == "Mes Portefeuilles") | \
                (df['metric_type'].str.contains('portfolio_'))
             
-        return df[mask].copy()
+        return df[mask]
 
     # --- [ Génération HTML & Graphiques ] ---
+    def __downsample_to_closes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Réduit chaque série à au plus MAX_POINTS_PER_SERIES points avant sérialisation.
+
+        L'historique est découpé en intervalles de N jours communs à toutes les séries
+        (les aires empilées restent alignées) et seule la dernière valeur de chaque
+        intervalle est conservée : les métriques étant des niveaux (valorisation,
+        performance...), le dernier point reste la valeur la plus récente.
+
+        Args:
+            - df (pd.DataFrame) : Données de performance, chronologiques au sein de chaque série.
+
+        Returns:
+            - pd.DataFrame : Données réduites (inchangées si l'historique est assez court).
+        """
+        first_date = df['date'].min()
+        span_days = (df['date'].max() - first_date).days + 1
+        step_days = -(-span_days // self.MAX_POINTS_PER_SERIES)
+
+        if step_days <= 1:
+            return df
+
+        bucket = ((df['date'] - first_date).dt.days // step_days).rename('bucket')
+        return df.groupby(['portfolio_name', 'metric_type', 'ticker', bucket], sort=False, dropna=False).tail(1)
+
     def __build_html_dashboard(self, df: pd.DataFrame):
         """Construit le fichier HTML intégrant la bibliothèque Highcharts et les données"""
         all_charts_config = []
+
+        df = self.__downsample_to_closes(df)
+
+        # Conversion au format JS faite une seule fois pour toutes les séries :
+        # timestamps en millisecondes et valeurs arrondies au centime
+        df = df.assign(
+            timestamp=df['date'].astype('datetime64[ms]').astype('int64'),
+            value=df['value'].astype(float).round(2)
+        )
+
         # Regroupement par portefeuille et type de métrique pour structurer les graphiques
-        grouped = df.sort_values(['metric_type', 'ticker']).groupby(['portfolio_name', 'metric_type'])
+        # (tri stable : l'ordre chronologique de la base est conservé dans chaque série)
+        grouped = df.sort_values(['metric_type', 'ticker'], kind='stable').groupby(['portfolio_name', 'metric_type'])
 
         for (portfolio, metric), data in grouped:
             series_list = []
@@ -86,13 +125,14 @@ class PortfolioVisualizer(TradeRepublicDatabase):
                 chart_style = "line"
                 stacking_type = None
                 
-            for ticker in data['ticker'].unique():
-                subset = data[data['ticker'] == ticker]
+            # Partition unique par ticker (ordre d'apparition conservé) au lieu
+            # d'un masque booléen complet recalculé pour chaque ticker
+            for ticker, subset in data.groupby('ticker', sort=False):
                 
-                # Conversion des données pour le format JS (Timestamp en MS, Valeur arrondie)
+                # Points [Timestamp en MS, Valeur arrondie], déjà convertis en amont
                 points = [
-                    [int(row['date'].timestamp() * 1000), round(float(row['value']), 2)] 
-                    for _, row in subset.iterrows()
+                    [timestamp, value]
+                    for timestamp, value in zip(subset['timestamp'].tolist(), subset['value'].tolist())
                 ]
                 
                 series_list.append({
@@ -119,7 +159,11 @@ class PortfolioVisualizer(TradeRepublicDatabase):
                         "series": {
                             "stacking": stacking_type,
                             "marker": {"enabled": False},
-                            "connectNulls": True
+                            "connectNulls": True,
+                            # Rendu allégé des longues séries : pas d'animation initiale
+                            # ni de ré-estompage de toutes les autres séries au survol
+                            "animation": False,
+                            "states": {"inactive": {"enabled": False}}
                         }
                     },
                     "series": series_list
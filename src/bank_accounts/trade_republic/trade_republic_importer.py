@@ -4,6 +4,7 @@ import re
 from datetime import date, datetime
 from difflib import SequenceMatcher
 
+import numpy as np
 import pandas as pd
 import pdfplumber
 
@@ -102,6 +103,30 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         'Pluxee': 'PLX.PA',
     }
 
+    # Ordre des colonnes du schéma de la table user_transaction
+    TRANSACTION_COLUMNS = (
+        'ticker',
+        'currency',
+        'operation',
+        'date',
+        'amount',
+        'fees',
+        'stock_price',
+        'quantity'
+    )
+
+    # Colonnes numériques de ce schéma, typées explicitement en float64 (None -> NaN)
+    NUMERIC_COLUMNS = ('amount', 'fees', 'stock_price', 'quantity')
+
+    # Motifs Regex appliqués à chaque PDF, compilés une seule fois au chargement de la classe
+    DATE_PATTERN = re.compile(r'DATE ((\d{2}/\d{2}/\d{4})|(\d{2}.\d{2}.\d{4}))')
+    COMPANY_NAME_PATTERN = re.compile(r"(POSITION|QUANTITÉ)[^\n]*\n([A-Za-zàâäéèêëîïôöùûü'\s&.-]+)")
+    ISIN_PATTERN = re.compile(r"\b[A-Z]{2}[A-Z0-9]{9}[0-9]\b")
+    SECURITIES_ACCOUNT_PATTERN = re.compile(r"COMPTE-TITRES\s+(\d+)")
+    DIVIDEND_QUANTITY_PATTERN = re.compile(r'([\d,.]+)\s+(?:unit\.|titre\(s\))')
+    DIVIDEND_FX_PATTERN = re.compile(r'([\d,.]+)\s+(EUR/USD|USD/EUR)')
+    DIVIDEND_TOTAL_PATTERN = re.compile(r'TOTAL\s+([\d,.]+)\s+(USD|EUR)')
+
     def __init__(self, db_path: str):
         """
         Initialise la base de données.
@@ -137,23 +162,21 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         if not unprocessed_data:
             return
 
-        # Regroupement par catégorie : on stocke des dictionnaires {id, content}
+        # Regroupement par catégorie : deux listes parallèles (IDs, contenus binaires)
+        # plutôt qu'un dictionnaire intermédiaire par fichier
         categorized_items = {}
         for entry in unprocessed_data:
             cat = entry['table_associee']
-            if cat not in categorized_items:
-                categorized_items[cat] = []
-            
+            items = categorized_items.get(cat)
+            if items is None:
+                items = categorized_items[cat] = ([], [])
+
             # On conserve l'ID pour pouvoir marquer comme traité plus tard
-            categorized_items[cat].append({
-                'id': entry['id'],
-                'content': entry['content']
-            })
-
-        for category, items in categorized_items.items():
-            # On extrait juste la liste des contenus binaires pour le processeur
-            blobs = [item['content'] for item in items]
-            
+            ids, blobs = items
+            ids.append(entry['id'])
+            blobs.append(entry['content'])
+
+        for category, (file_ids, blobs) in categorized_items.items():
             # Le dispatcher doit maintenant envoyer des blobs
             df = self.__dispatch_to_processor(category, blobs)
 
@@ -175,8 +198,8 @@ class TradeRepublicImporter(TradeRepublicDatabase):
                 self._insert_transactions_from_df(df)
 
             # Marquer le fichier comme traité en utilisant l'ID unique de la base
-            for item in items:
-                self._mark_file_as_processed(item['id'])
+            for file_id in file_ids:
+                self._mark_file_as_processed(file_id)
         
     def __dispatch_to_processor(self, category: str, pdf_blobs: list) -> pd.DataFrame:
         """
@@ -215,25 +238,30 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         for folder_name in self.SOURCE_DIRECTORIES:
             folder_path = os.path.join(self.DATA_FILE, folder_name)
 
-            if not os.path.exists(folder_path):
+            # Listage direct : l'absence du dossier est détectée sans appel système préalable.
+            # scandir renvoie le type de chaque entrée avec le listage (pas de stat supplémentaire)
+            try:
+                with os.scandir(folder_path) as entries:
+                    pdf_paths = [
+                        entry.path for entry in entries
+                        if entry.name.lower().endswith('.pdf') and entry.is_file()
+                    ]
+            except FileNotFoundError:
                 print(f"Avertissement : Le dossier {folder_path} n'existe pas. Passage au suivant.")
                 continue
 
-            for file_name in os.listdir(folder_path):
-                if file_name.lower().endswith('.pdf'):
-                    full_path = os.path.join(folder_path, file_name)
-                    
-                    # 1. Insertion en base de données
-                    # On stocke d'abord pour vérifier si c'est un doublon binaire
-                    result = self._insert_pdf_to_database(
-                        file_path=full_path,
-                        table_name=folder_name
-                    )
-
-                    # 2. Renommage physique du fichier si l'insertion a réussi ou si le fichier est nouveau
-                    # On ne renomme que si result != -1 (pas un doublon binaire déjà en base)
-                    if result != -1:
-                        self.__trigger_file_renaming(full_path, folder_path, folder_name)
+            for full_path in pdf_paths:
+                # 1. Insertion en base de données
+                # On stocke d'abord pour vérifier si c'est un doublon binaire
+                result = self._insert_pdf_to_database(
+                    file_path=full_path,
+                    table_name=folder_name
+                )
+
+                # 2. Renommage physique du fichier si l'insertion a réussi ou si le fichier est nouveau
+                # On ne renomme que si result != -1 (pas un doublon binaire déjà en base)
+                if result != -1:
+                    self.__trigger_file_renaming(full_path, folder_path, folder_name)
 
     def __trigger_file_renaming(self, file_path: str, folder_path: str, category: str):
         """
@@ -268,7 +296,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         pdf_text = self.__extract_pdf_text(file_path)
         
         # Extraction et formatage de la date
-        raw_date = self.__regex_extract(pdf_text, r'DATE ((\d{2}/\d{2}/\d{4})|(\d{2}.\d{2}.\d{4}))', 1).replace('.', '/')
+        raw_date = self.__regex_extract(pdf_text, self.DATE_PATTERN, 1).replace('.', '/')
         formatted_date = datetime.strptime(raw_date, '%d/%m/%Y').strftime('%Y-%m-%d')
 
         target_path = self.__get_unique_path(folder_path, formatted_date)
@@ -288,10 +316,10 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         """
         pdf_text = self.__extract_pdf_text(file_path)
         
-        raw_date = self.__regex_extract(pdf_text, r'DATE ((\d{2}/\d{2}/\d{4})|(\d{2}.\d{2}.\d{4}))', 1).replace('.', '/')
+        raw_date = self.__regex_extract(pdf_text, self.DATE_PATTERN, 1).replace('.', '/')
         operation_date = datetime.strptime(raw_date, '%d/%m/%Y').strftime('%Y-%m-%d')
         
-        ticker_symbol = self.__regex_extract(pdf_text, r"(POSITION|QUANTITÉ)[^\n]*\n([A-Za-zàâäéèêëîïôöùûü'\s&.-]+)", 2).strip()
+        ticker_symbol = self.__regex_extract(pdf_text, self.COMPANY_NAME_PATTERN, 2).strip()
 
         new_name = f"{ticker_symbol} ({operation_date})"
         target_path = self.__get_unique_path(folder_path, new_name)
@@ -313,12 +341,12 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         pdf_text = self.__extract_pdf_text(file_path)
         
         # Extraction et normalisation de la date
-        date_match = self.__regex_extract(pdf_text, r'DATE ((\d{2}/\d{2}/\d{4})|(\d{2}.\d{2}.\d{4}))', 1)
+        date_match = self.__regex_extract(pdf_text, self.DATE_PATTERN, 1)
         normalized_date = re.sub(r'[-.]', '/', date_match)
         operation_date = datetime.strptime(normalized_date, '%d/%m/%Y').strftime('%Y-%m-%d')
 
         if is_buy_order:
-            ticker_symbol = self.__regex_extract(pdf_text, r"(POSITION|QUANTITÉ)[^\n]*\n([A-Za-zàâäéèêëîïôöùûü'\s&.-]+)", 2).strip()
+            ticker_symbol = self.__regex_extract(pdf_text, self.COMPANY_NAME_PATTERN, 2).strip()
             file_prefix = f"{ticker_symbol} ({operation_date})"
         else:
             ticker_symbol = self.__regex_extract(pdf_text, r'(?:POSITION QUANTITÉ PRIX MONTANT|TITRE ORDRE / QUANTITÉ VALEUR)\s+([^\n]+)', 1).strip()
@@ -351,7 +379,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         Returns:
             pd.DataFrame: DataFrame contenant les dépôts structurés.
         """
-        records = []
+        records = self.__init_records()
         for blob in pdf_blobs:
             text = self.__extract_pdf_text(blob)
             
@@ -370,18 +398,19 @@ class TradeRepublicImporter(TradeRepublicDatabase):
             val_date_str = self.__regex_extract(text, cash_pattern, 1)
             val_date = self.__parse_date(val_date_str) if val_date_str else None
 
-            records.append({
-                'ticker': None,
-                'currency': 'EUR',
-                'operation': 'deposit',
-                'date': val_date,
-                'amount': gross_amount,
-                'fees': fees,
-                'stock_price': None,
-                'quantity': None
-            })
+            self.__append_record(
+                records,
+                ticker=None,
+                currency='EUR',
+                operation='deposit',
+                date=val_date,
+                amount=gross_amount,
+                fees=fees,
+                stock_price=None,
+                quantity=None
+            )
             
-        return pd.DataFrame(records)
+        return self.__records_to_dataframe(records)
 
     def __process_dividend_data(self, pdf_blobs: list) -> pd.DataFrame:
         """
@@ -397,7 +426,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         Returns:
             pd.DataFrame: DataFrame des dividendes avec montants et taxes en EUR.
         """
-        records = []
+        records = self.__init_records()
         for blob in pdf_blobs:
             text = self.__extract_pdf_text(blob)
             base = self.__extract_transaction_base_data(text)
@@ -407,7 +436,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
 
             # --- [ Extraction de la Quantité ] ---
             # Regex gérant le point ou la virgule, suivi de "unit." ou "titre(s)"
-            qty_match = re.search(r'([\d,.]+)\s+(?:unit\.|titre\(s\))', text)
+            qty_match = self.DIVIDEND_QUANTITY_PATTERN.search(text)
             quantity = 0.0
             if qty_match:
                 # On remplace la virgule par un point pour le cast en float
@@ -415,7 +444,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
 
             # --- [ Analyse du Taux de Change ] ---
             # On capture la valeur et l'unité (ex: 1.1715 et USD/EUR)
-            fx_match = re.search(r'([\d,.]+)\s+(EUR/USD|USD/EUR)', text)
+            fx_match = self.DIVIDEND_FX_PATTERN.search(text)
             fx_rate = 1.0
             fx_direction = "EUR/USD"
             
@@ -425,7 +454,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
 
             # --- [ Extraction des Totaux ] ---
             # On récupère tous les couples (Montant, Devise) associés au mot TOTAL
-            all_totals = re.findall(r'TOTAL\s+([\d,.]+)\s+(USD|EUR)', text)
+            all_totals = self.DIVIDEND_TOTAL_PATTERN.findall(text)
             if not all_totals:
                 continue
 
@@ -449,18 +478,19 @@ class TradeRepublicImporter(TradeRepublicDatabase):
             # Calcul de la taxe par différentiel
             tax_value = round(gross_in_eur - net_in_eur, 2)
 
-            records.append({
-                'ticker': base['ticker'],
-                'currency': 'EUR',
-                'operation': 'dividend',
-                'date': pay_date,
-                'amount': gross_in_eur,
-                'fees': max(0.0, tax_value),
-                'stock_price': None,
-                'quantity': quantity
-            })
-
-        return pd.DataFrame(records)
+            self.__append_record(
+                records,
+                ticker=base['ticker'],
+                currency='EUR',
+                operation='dividend',
+                date=pay_date,
+                amount=gross_in_eur,
+                fees=max(0.0, tax_value),
+                stock_price=None,
+                quantity=quantity
+            )
+
+        return self.__records_to_dataframe(records)
     
     def __process_order_buy_data(self, pdf_blobs: list) -> pd.DataFrame:
         """
@@ -476,7 +506,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         Returns:
             pd.DataFrame: DataFrame contenant les transactions d'achat.
         """
-        records = []
+        records = self.__init_records()
         for blob in pdf_blobs:
             text = self.__extract_pdf_text(blob)
             base = self.__extract_transaction_base_data(text)
@@ -507,18 +537,19 @@ class TradeRepublicImporter(TradeRepublicDatabase):
             price_pattern = r'POSITION QUANTITÉ (?:COURS MOYEN|PRIX) MONTANT\s+.*?\s([\d,]+)\sEUR'
             stock_price = float(self.__regex_extract(text, price_pattern, 1).replace(',', '.'))
             
-            records.append({
-                'ticker': base['ticker'],
-                'currency': 'EUR',
-                'operation': 'buy',
-                'date': exec_date,
-                'amount': total_invested,
-                'fees': fees,
-                'stock_price': stock_price,
-                'quantity': qty
-            })
-
-        return pd.DataFrame(records)
+            self.__append_record(
+                records,
+                ticker=base['ticker'],
+                currency='EUR',
+                operation='buy',
+                date=exec_date,
+                amount=total_invested,
+                fees=fees,
+                stock_price=stock_price,
+                quantity=qty
+            )
+
+        return self.__records_to_dataframe(records)
     
     def __process_interest_data(self, pdf_blobs: list) -> pd.DataFrame:
         """
@@ -530,7 +561,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         Returns:
             pd.DataFrame: DataFrame contenant les intérêts structurés.
         """
-        records = []
+        records = self.__init_records()
         for blob in pdf_blobs:
             text = self.__extract_pdf_text(blob)
             
@@ -573,18 +604,19 @@ class TradeRepublicImporter(TradeRepublicDatabase):
                 # Fallback sur la date d'effet standard si la ligne complexe échoue
                 effective_date = self.__parse_date(self.__regex_extract(text, r'DATE D\'EFFET\s+(\d{2}/\d{2}/\d{4})', 1))
 
-            records.append({
-                'ticker': None,
-                'currency': 'EUR',
-                'operation': 'interest',
-                'date': effective_date,
-                'amount': amount,
-                'fees': 0.0,
-                'stock_price': None,
-                'quantity': None
-            })
+            self.__append_record(
+                records,
+                ticker=None,
+                currency='EUR',
+                operation='interest',
+                date=effective_date,
+                amount=amount,
+                fees=0.0,
+                stock_price=None,
+                quantity=None
+            )
 
-        return pd.DataFrame(records)
+        return self.__records_to_dataframe(records)
 
     def __process_order_sell_data(self, pdf_blobs: list) -> pd.DataFrame:
         """
@@ -596,7 +628,7 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         Returns:
             pd.DataFrame: Données de vente structurées.
         """
-        records = []
+        records = self.__init_records()
         for blob in pdf_blobs:
             text = self.__extract_pdf_text(blob)
             base = self.__extract_transaction_base_data(text)
@@ -640,18 +672,19 @@ class TradeRepublicImporter(TradeRepublicDatabase):
             # Calcul des frais par différence (en valeur absolue)
             fees = round(abs(gross_sale_amount - net_proceeds), 2)
 
-            records.append({
-                'ticker': base['ticker'],
-                'currency': 'EUR',
-                'operation': 'sell',
-                'date': exec_date,
-                'amount': abs(gross_sale_amount),
-                'fees': fees,
-                'stock_price': unit_price,
-                'quantity': quantity
-            })
-
-        return pd.DataFrame(records)
+            self.__append_record(
+                records,
+                ticker=base['ticker'],
+                currency='EUR',
+                operation='sell',
+                date=exec_date,
+                amount=abs(gross_sale_amount),
+                fees=fees,
+                stock_price=unit_price,
+                quantity=quantity
+            )
+
+        return self.__records_to_dataframe(records)
     
 
     # --- [ Gestion des Tickers & Référentiels ] ---
@@ -764,21 +797,22 @@ class TradeRepublicImporter(TradeRepublicDatabase):
             error_msg = 'Données binaires' if isinstance(source, bytes) else source
             raise RuntimeError(f'Erreur lors de l\'extraction PDF ({error_msg}) : {error}')
         
-    def __regex_extract(self, text: str, pattern: str, group_index: int) -> str:
+    def __regex_extract(self, text: str, pattern: str | re.Pattern, group_index: int) -> str:
         """
         Extrait une information via Regex sans bloquer l'exécution en cas d'absence.
 
         Args:
             text (str): Le texte source à analyser.
-            pattern (str): Le motif Regex à rechercher.
+            pattern (str | re.Pattern): Le motif Regex à rechercher (chaîne ou motif précompilé).
             group_index (int): L'index du groupe de capture à retourner.
 
         Returns:
             str: La donnée extraite ou None si le motif n'est pas trouvé.
         """
-        import re
-        
-        match = re.search(pattern, text)
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+
+        match = pattern.search(text)
         if match:
             try:
                 return match.group(group_index)
@@ -816,13 +850,45 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         })
 
         # Réorganisation des colonnes selon le schéma de la table user_transaction
-        column_order = [
-            'ticker', 'currency', 'operation', 'date', 
-            'amount', 'fees', 'stock_price', 'quantity'
-        ]
-        
-        return aggregated_df[column_order]
+        return aggregated_df[list(self.TRANSACTION_COLUMNS)]
     
+    def __init_records(self) -> dict:
+        """Initialise l'accumulateur des transactions extraites (une liste par colonne)."""
+        return {column: [] for column in self.TRANSACTION_COLUMNS}
+
+    def __append_record(self, records: dict, **fields):
+        """
+        Ajoute une transaction à l'accumulateur colonne par colonne.
+
+        Construire le DataFrame à partir d'un dictionnaire de listes évite 
+        l'inférence ligne par ligne d'une liste de dictionnaires.
+
+        Args:
+            records (dict): Accumulateur créé par '__init_records'.
+            **fields: Valeurs de la transaction indexées par nom de colonne.
+        """
+        for column in self.TRANSACTION_COLUMNS:
+            records[column].append(fields.get(column))
+
+    def __records_to_dataframe(self, records: dict) -> pd.DataFrame:
+        """
+        Construit le DataFrame des transactions à partir de l'accumulateur colonne par colonne.
+
+        Les colonnes numériques sont converties directement en tableaux float64,
+        sans inférence de type sur les listes Python (les None deviennent NaN).
+
+        Args:
+            records (dict): Accumulateur créé par '__init_records'.
+
+        Returns:
+            pd.DataFrame: Transactions au format 'user_transaction'.
+        """
+        columns = dict(records)
+        for column in self.NUMERIC_COLUMNS:
+            columns[column] = np.asarray(records[column], dtype=np.float64)
+
+        return pd.DataFrame(columns, columns=self.TRANSACTION_COLUMNS)
+
     def __parse_date(self, date_string: str) -> date:
         """
         Convertit une chaîne de caractères en objet date, gérant divers formats.
@@ -874,10 +940,10 @@ class TradeRepublicImporter(TradeRepublicDatabase):
         Returns:
             dict: Dictionnaire contenant ISIN, Ticker et Compte-titres.
         """
-        isin = self.__regex_extract(text, r"\b[A-Z]{2}[A-Z0-9]{9}[0-9]\b", 0)
-        account = self.__regex_extract(text, r"COMPTE-TITRES\s+(\d+)", 1)
+        isin = self.__regex_extract(text, self.ISIN_PATTERN, 0)
+        account = self.__regex_extract(text, self.SECURITIES_ACCOUNT_PATTERN, 1)
         
-        raw_name = self.__regex_extract(text, r"(POSITION|QUANTITÉ)[^\n]*\n([A-Za-zàâäéèêëîïôöùûü'\s&.-]+)", 2)
+        raw_name = self.__regex_extract(text, self.COMPANY_NAME_PATTERN, 2)
         clean_name = self.__clean_company_name(raw_name)
         ticker = self.__map_company_name_to_ticker(clean_name)
         
@@ -1,11 +1,27 @@
+import functools
 import json
 import os
 
 CONFIG_PATH = os.path.join("config.json")
 
 
+@functools.lru_cache(maxsize=4)
+def _read_config_bytes(path: str, mtime_ns: int, ctime_ns: int, inode: int, size: int) -> bytes:
+    # Contenu brut mis en cache par (chemin, dates de modification et de changement, inode, taille).
+    # Limite : sur un système de fichiers à horodatage grossier, une modification externe de même
+    # taille faite dans le même intervalle d'horodatage peut passer inaperçue. Les écritures faites
+    # par save_config vident explicitement le cache
+    with open(path, "rb") as f:
+        return f.read()
+
+
 def load_config() -> dict:
-    if not os.path.exists(CONFIG_PATH):
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except FileNotFoundError:
+        stat = None
+
+    if stat is None:
         # Créer un fichier par défaut s'il n'existe pas
         default_config = {
             "bank": "Non défini",
@@ -82,10 +98,12 @@ def load_config() -> dict:
             json.dump(default_config, f, indent=4)
         return default_config
 
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # Lecture brute en octets (json.loads détecte l'UTF-8 sans passer par le décodeur texte).
+    # Chaque appel renvoie un nouveau dictionnaire : les appelants peuvent le modifier librement
+    return json.loads(_read_config_bytes(CONFIG_PATH, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino, stat.st_size))
 
 
 def save_config(data):
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    _read_config_bytes.cache_clear()
@@ -18,12 +18,13 @@ class CtkDateEntry(ctk.CTkFrame):
         self.__entry = ctk.CTkEntry(self, textvariable=self.__date_var, width=150)
         self.__entry.pack(side="left", padx=(0, 5))
 
+        button_theme = load_config()["theme"]["blue_01"]
         self.__btn = ctk.CTkButton(
             self,
             text="📅",
             width=40,
-            fg_color=load_config()["theme"]["blue_01"]["fg_color"],
-            hover_color=load_config()["theme"]["blue_01"]["hover_color"],
+            fg_color=button_theme["fg_color"],
+            hover_color=button_theme["hover_color"],
             command=self.__open_calendar,
         )
         self.__btn.pack(side="left")
@@ -279,7 +279,8 @@ class Dashboard(ctk.CTk):
             full_config["bank"] = bank
 
             save_config(full_config)
-            self.__config = load_config()
+            # Le dictionnaire qui vient d'être écrit est repris tel quel, sans relire le fichier
+            self.__config = full_config
             self.__db = BnpParibasDatabase(self.__db_path)
 
         except Exception as e:
@@ -613,7 +614,8 @@ class Dashboard(ctk.CTk):
             full_config["database"]["expenses"]["categories_subcategories"] = new_db_config["expenses"]
 
             save_config(full_config)
-            self.__config = load_config()
+            # Le dictionnaire qui vient d'être écrit est repris tel quel, sans relire le fichier
+            self.__config = full_config
             self.__db = BnpParibasDatabase(self.__db_path)
 
             messagebox.showinfo("Succès", "Toutes les catégories ont été mises à jour avec succès !")
@@ -1449,14 +1451,14 @@ class Dashboard(ctk.CTk):
         # Scan des fichiers HTML disponibles
         # On cherche les fichiers qui finissent par .html (ex: Bilan 2026.html, Bilan 2020-2026.html)
         available_years = []
-        for file in os.listdir(bilan_dir):
-            if file.endswith(".html"):
-                # Extraction : "Bilan 2026.html" -> "2026"
-                year_name = file.replace("Bilan ", "").replace(".html", "")
+        with os.scandir(bilan_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".html") and entry.is_file():
+                    # Extraction : "Bilan 2026.html" -> "2026"
+                    year_name = entry.name.replace("Bilan ", "").replace(".html", "")
 
-                # On construit le chemin relatif vers le fichier
-                file_path = os.path.join(bilan_dir, file)
-                available_years.append({"year": year_name, "path": file_path})
+                    # Le chemin relatif vers le fichier est fourni directement par l'entrée
+                    available_years.append({"year": year_name, "path": entry.path})
 
         # Trier les années par ordre décroissant
         available_years.sort(key=lambda x: (1 if "-" in x["year"] else 0, x["year"]), reverse=True)
@@ -1553,14 +1555,14 @@ class Dashboard(ctk.CTk):
         # Scan des fichiers HTML disponibles
         # On cherche les fichiers qui finissent par .xlsx (ex: Bilan 2026.xlsx, Bilan 2020-2026.xlsx)
         available_years = []
-        for file in os.listdir(bilan_dir):
-            if file.endswith(".xlsx"):
-                # Extraction : "Bilan 2026.xlsx" -> "2026"
-                year_name = file.replace("Bilan ", "").replace(".xlsx", "")
-
-                # On construit le chemin relatif vers le fichier
-                file_path = os.path.join(bilan_dir, file)
-                available_years.append({"year": year_name, "path": file_path})
+        with os.scandir(bilan_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".xlsx") and entry.is_file():
+                    # Extraction : "Bilan 2026.xlsx" -> "2026"
+                    year_name = entry.name.replace("Bilan ", "").replace(".xlsx", "")
+
+                    # Le chemin relatif vers le fichier est fourni directement par l'entrée
+                    available_years.append({"year": year_name, "path": entry.path})
 
         # Trier les années par ordre décroissant
         available_years.sort(key=lambda x: (1 if "-" in x["year"] else 0, x["year"]), reverse=True)
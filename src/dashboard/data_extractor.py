@@ -56,9 +56,14 @@ class DataExtractor:
         try:
             # Extraction brute selon l'extension
             if extension == ".xls":
-                workbook = xlrd.open_workbook(file_path)
-                sheet = workbook.sheet_by_index(0)
-                raw_rows = [sheet.row_values(i) for i in range(sheet.nrows)]
+                # Seule la première feuille est analysée (on_demand) ; les cellules vides restent des ''
+                # et les lignes vides sont conservées, ce dont dépend la détection de fin de tableau
+                workbook = xlrd.open_workbook(file_path, on_demand=True)
+                try:
+                    sheet = workbook.sheet_by_index(0)
+                    raw_rows = [sheet.row_values(i) for i in range(sheet.nrows)]
+                finally:
+                    workbook.release_resources()
             else:
                 df_raw = pd.read_excel(file_path, engine="openpyxl", header=None)
                 raw_rows = df_raw.values.tolist()
@@ -99,8 +104,7 @@ class DataExtractor:
 
             # Conversion des dates
             date_col = "date operation"
-            operations_df[date_col] = operations_df[date_col].apply(self.__excel_date_to_datetime)
-            operations_df[date_col] = pd.to_datetime(operations_df[date_col])
+            operations_df[date_col] = self.__excel_dates_to_datetime(operations_df[date_col])
 
             # On renomme pour correspondre aux noms de la base de données
             column_mapping = {
@@ -109,7 +113,8 @@ class DataExtractor:
                 "montant operation en euro": "amount",
             }
             operations_df = operations_df.rename(columns=column_mapping)
-            operations_df["operation_date"] = pd.to_datetime(operations_df["operation_date"]).dt.strftime("%Y-%m-%d")
+            # La colonne est déjà typée datetime : formatage direct, sans nouvelle conversion
+            operations_df["operation_date"] = operations_df["operation_date"].dt.strftime("%Y-%m-%d")
 
             return operations_df[["operation_date", "label", "amount"]]
 
@@ -130,11 +135,15 @@ class DataExtractor:
                 decimal=",",
             )
 
-            # Nettoyage HTML
-            df = df.map(lambda x: html.unescape(str(x)) if isinstance(x, str) else x)
+            # Nettoyage HTML : seules les cellules texte contenant une entité ('&') sont décodées,
+            # les colonnes numériques typées par read_csv ne sont pas parcourues
+            for column in df.select_dtypes(include=["object", "string"]).columns:
+                has_entity = df[column].str.contains("&", regex=False, na=False)
+                if has_entity.any():
+                    df.loc[has_entity, column] = df.loc[has_entity, column].map(html.unescape)
 
             # Filtrage des lignes de transactions uniquement
-            df = df[df[0].str.contains(r"\d{2}/\d{2}/\d{4}", na=False)].copy()
+            df = df[df[0].str.contains(r"\d{2}/\d{2}/\d{4}", na=False)]
 
             df = df.iloc[:, 0:5]
             df.columns = [
@@ -147,7 +156,13 @@ class DataExtractor:
 
             df["montant"] = pd.to_numeric(df["montant"], errors="coerce")
             df = df.dropna(subset=["montant"])
-            df["operation_date"] = pd.to_datetime(df["operation_date"], dayfirst=True)
+            # Format connu des exports BNP : analyse vectorisée sans inférence ligne par ligne.
+            # Le filtre des lignes n'est pas ancré : les espaces parasites sont retirés, et une
+            # cellule qui ne respecte pas le format écarte sa ligne au lieu d'interrompre l'import
+            df["operation_date"] = pd.to_datetime(
+                df["operation_date"].str.strip(), format="%d/%m/%Y", errors="coerce"
+            )
+            df = df.dropna(subset=["operation_date"])
 
             self.__apply_business_rules(df)
             return df
@@ -207,8 +222,7 @@ class DataExtractor:
 
         # Conversion des dates
         date_col = "date operation"
-        operations_df[date_col] = operations_df[date_col].apply(self.__excel_date_to_datetime)
-        operations_df[date_col] = pd.to_datetime(operations_df[date_col])
+        operations_df[date_col] = self.__excel_dates_to_datetime(operations_df[date_col])
 
         # On renomme pour correspondre aux noms de la base de données
         column_mapping = {
@@ -228,10 +242,12 @@ class DataExtractor:
     def __apply_business_rules(self, df: pd.DataFrame) -> pd.DataFrame:
         """Applique les transformations de nettoyage sur les libellés et les dates."""
 
-        for index, row in df.iterrows():
-            libelle = str(row["label"])
+        for index, label, short_label, operation_type in zip(
+            df.index, df["label"].tolist(), df["short_label"].tolist(), df["operation_type"].tolist()
+        ):
+            libelle = str(label)
 
-            if row["short_label"] == "PAIEMENT CB":
+            if short_label == "PAIEMENT CB":
                 df.at[index, "label"] = self.__extract_between_slashes(libelle, 0, -2)
                 new_date, new_libelle = self.__extract_date_from_libelle(libelle)
                 if new_date:
@@ -239,20 +255,33 @@ class DataExtractor:
                 if new_libelle:
                     df.at[index, "label"] = self.__clean_libelle_spacing(new_libelle)
 
-            elif row["operation_type"] == "VIR CPTE A CPTE EMIS":
+            elif operation_type == "VIR CPTE A CPTE EMIS":
                 clean_txt = self.__extract_between_slashes(libelle, 0, -2)
                 df.at[index, "label"] = self.__clean_libelle_spacing(clean_txt)
 
-            elif row["operation_type"] in ["VIR CPTE A CPTE RECU", "VIR SEPA RECU"]:
+            elif operation_type in ["VIR CPTE A CPTE RECU", "VIR SEPA RECU"]:
                 clean_txt = self.__extract_between_slashes(libelle, 0, -1)
                 df.at[index, "label"] = self.__clean_libelle_spacing(clean_txt)
 
-            elif row["operation_type"] == "REMISE CHEQUES":
+            elif operation_type == "REMISE CHEQUES":
                 clean_txt = self.__extract_between_slashes(libelle, 0, 0)
                 df.at[index, "label"] = self.__clean_libelle_spacing(clean_txt)
 
         return df
 
+    def __excel_dates_to_datetime(self, dates: pd.Series) -> pd.Series:
+        """
+        Convertit une colonne de dates (numéros de série Excel ou dates déjà typées) en datetime.
+
+        Le type est vérifié une seule fois pour toute la colonne : une colonne numérique
+        est convertie en bloc, seule une colonne mixte repasse par la conversion valeur par valeur.
+        """
+
+        if pd.api.types.is_numeric_dtype(dates) and not pd.api.types.is_bool_dtype(dates):
+            return pd.to_datetime(dates, unit="D", origin=pd.Timestamp(1899, 12, 30))
+
+        return pd.to_datetime(dates.apply(self.__excel_date_to_datetime))
+
     def __excel_date_to_datetime(self, excel_date: float) -> datetime:
         """Convertit un nombre Excel en objet datetime."""
 
@@ -191,25 +191,25 @@ class BnpParibasDatabase(Database):
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Calcule le nombre total d'opérations et ceux qui sont déjà triés
-            cursor.execute("SELECT COUNT(*), COUNT(category_id) FROM raw_data WHERE account_id = ?", (account_id,))
+            # Nombre total d'opérations, opérations déjà triées et somme d'argent sur le compte,
+            # agrégés par SQLite en un seul parcours des lignes du compte
+            cursor.execute(
+                "SELECT COUNT(*), COUNT(category_id), COALESCE(SUM(amount), 0) FROM raw_data WHERE account_id = ?",
+                (account_id,),
+            )
 
             res = cursor.fetchone()
             if res:
                 stats["total"] = res[0]
                 stats["processed"] = res[1]
                 stats["remaining"] = stats["total"] - stats["processed"]
+                stats["account_amount"] = res[2]
 
             # Nombre de catégories créées
             cursor.execute("SELECT COUNT(*) FROM categories")
             res_cat = cursor.fetchone()
             stats["categories"] = res_cat[0] if res_cat else 0
 
-            # Somme d'argent sur le compte
-            cursor.execute("SELECT COALESCE(SUM(amount), 0) FROM raw_data WHERE account_id = ?", (account_id,))
-            res_sum = cursor.fetchone()
-            stats["account_amount"] = res_sum[0]
-
         return stats
 
     def get_categories_hierarchy(self) -> tuple[dict, dict]:
@@ -233,11 +233,13 @@ class BnpParibasDatabase(Database):
             for cat, sub, ty in cursor.fetchall():
                 target_dict = mapping.get(ty)
 
-                if cat not in target_dict:
-                    target_dict[cat] = []
+                # Une seule recherche dans le dictionnaire par ligne
+                sub_categories = target_dict.get(cat)
+                if sub_categories is None:
+                    sub_categories = target_dict[cat] = []
 
                 if sub:
-                    target_dict[cat].append(sub)
+                    sub_categories.append(sub)
 
         return incomes, expenses
 
@@ -317,7 +319,8 @@ class BnpParibasDatabase(Database):
 
             df = pd.read_sql_query(query, conn, params=(account_id,))
 
-        df["operation_date"] = pd.to_datetime(df["operation_date"])
+        # Dates stockées au format ISO (avec ou sans heure) : pas d'inférence de format
+        df["operation_date"] = pd.to_datetime(df["operation_date"], format="ISO8601")
 
         return df
 
@@ -348,13 +351,18 @@ class BnpParibasDatabase(Database):
         operations["year"] = operations["operation_date"].dt.year
         operations["amount"] = operations["amount"].abs()
 
-        # 3. On traite les données
-        years_dict = {}
-        for year, year_operations_df in operations.groupby("year"):
-            incomes_df = year_operations_df[year_operations_df["category"].isin(incomes_list)]
-            expenses_df = year_operations_df[year_operations_df["category"].isin(expenses_list)]
+        # 3. On traite les données : les masques revenus/dépenses sont évalués une seule fois
+        # sur l'ensemble des opérations, puis chaque année est découpée par positions
+        is_income = operations["category"].isin(incomes_list).to_numpy()
+        is_expense = operations["category"].isin(expenses_list).to_numpy()
 
-            years_dict[int(year)] = {"all": year_operations_df, "incomes": incomes_df, "expenses": expenses_df}
+        years_dict = {}
+        for year, positions in operations.groupby("year").indices.items():
+            years_dict[int(year)] = {
+                "all": operations.take(positions),
+                "incomes": operations.take(positions[is_income[positions]]),
+                "expenses": operations.take(positions[is_expense[positions]]),
+            }
 
         return years_dict
 
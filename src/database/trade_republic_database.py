@@ -1,14 +1,20 @@
 import concurrent.futures
-import os
 import sqlite3
 from collections import defaultdict
 from datetime import datetime
+from itertools import repeat
+from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
 
 from .database import Database
 
+# yfinance n'est importé qu'au moment d'interroger Yahoo Finance (coût d'import élevé
+# pour les modules qui ne font que lire la base : performances, visualisation, patrimoine)
+if TYPE_CHECKING:
+    import yfinance as yf
+
 
 class TradeRepublicDatabase(Database):
     """
@@ -24,6 +30,8 @@ class TradeRepublicDatabase(Database):
     def __init__(self, db_path):
         super().__init__(db_path)
         self._create_database()
+        # Historique EURUSD=X mis en cache : relu uniquement après une mise à jour des prix
+        self.__fx_rates_cache = None
 
     # --- [ Configuration & Schéma ] ---
     def _create_database(self):
@@ -143,6 +151,8 @@ class TradeRepublicDatabase(Database):
         if not tickers:
             return
 
+        import yfinance as yf
+
         # Fonction interne pour encapsuler la récupération réseau
         def __fetch_metadata(ticker_symbol: str) -> dict:
             try:
@@ -195,6 +205,8 @@ class TradeRepublicDatabase(Database):
         if not tickers:
             return
 
+        import yfinance as yf
+
         # On cherche la dernière date connue pour chaque ticker pour optimiser l'appel
         last_dates = [self.__get_last_date_in_table("stock_price", t) for t in tickers]
 
@@ -233,18 +245,17 @@ class TradeRepublicDatabase(Database):
                 temp_df["ticker"] = ticker
                 temp_df["formatted_date"] = temp_df["Date"].dt.strftime("%Y-%m-%d")
 
-                for _, row in temp_df.iterrows():
-                    price_records.append(
-                        (
-                            row["ticker"],
-                            row["formatted_date"],
-                            float(row["Open"]),
-                            float(row["High"]),
-                            float(row["Low"]),
-                            float(row["Close"]),
-                            int(row["Volume"]),
-                        )
+                price_records.extend(
+                    zip(
+                        temp_df["ticker"].tolist(),
+                        temp_df["formatted_date"].tolist(),
+                        temp_df["Open"].astype(float).tolist(),
+                        temp_df["High"].astype(float).tolist(),
+                        temp_df["Low"].astype(float).tolist(),
+                        temp_df["Close"].astype(float).tolist(),
+                        temp_df["Volume"].astype(int).tolist(),
                     )
+                )
             except KeyError:
                 # Cas où un ticker demandé n'est pas retourné par l'API
                 continue
@@ -260,6 +271,9 @@ class TradeRepublicDatabase(Database):
                     cursor = conn.cursor()
                     cursor.executemany(query, price_records)
 
+                # Les taux de change ont pu changer : le cache sera rechargé au prochain appel
+                self.__fx_rates_cache = None
+
             except sqlite3.Error as error:
                 raise RuntimeError(f"Erreur lors de l'insertion massive des prix : {error}")
 
@@ -307,7 +321,7 @@ class TradeRepublicDatabase(Database):
         except sqlite3.Error as error:
             raise RuntimeError(f"Erreur lors de l'UPSERT des infos de l'entreprise {ticker} : {error}")
 
-    def __update_dividends(self, ticker: str, stock_obj: yf.Ticker):
+    def __update_dividends(self, ticker: str, stock_obj: "yf.Ticker"):
         """
         Récupère et insère les dividendes versés par une entreprise.
 
@@ -337,7 +351,7 @@ class TradeRepublicDatabase(Database):
         except sqlite3.Error as error:
             raise RuntimeError(f"Erreur lors de la mise à jour des dividendes pour {ticker} : {error}")
 
-    def __update_splits(self, ticker: str, stock_obj: yf.Ticker):
+    def __update_splits(self, ticker: str, stock_obj: "yf.Ticker"):
         """Récupère et insère les fractionnements d'actions (splits) depuis Yahoo Finance."""
 
         # Récupération de la série temporelle des splits
@@ -381,32 +395,37 @@ class TradeRepublicDatabase(Database):
         if splits.empty or df.empty:
             return df
 
-        # Copie profonde pour garantir l'intégrité du DataFrame original
-        adjusted_df = df.copy()
-
         # Tri des splits par date (du plus ancien au plus récent)
         # Indispensable pour appliquer les ratios de manière cumulative
         splits = splits.sort_values(by="date", ascending=True)
 
-        for _, split in splits.iterrows():
-            ticker = split["ticker"]
-            split_date = split["date"]
-            ratio = float(split["ratio"])
+        # L'index des transactions est trié : les lignes antérieures à un split
+        # forment un préfixe, localisé par recherche dichotomique
+        # Seules ces deux colonnes sont copiées (tableaux modifiés sur place) ; le DataFrame
+        # d'origine n'est pas dupliqué, assign partage les autres colonnes (copy-on-write)
+        tickers = df["ticker"].to_numpy()
+        quantities = df["quantity"].to_numpy(dtype=float, copy=True)
+        stock_prices = df["stock_price"].to_numpy(dtype=float, copy=True)
+
+        for ticker, split_date, ratio in zip(
+            splits["ticker"].tolist(), splits["date"].tolist(), splits["ratio"].astype(float).tolist()
+        ):
 
             # Cible : transactions du même ticker effectuées STRICTEMENT AVANT le split
-            mask = (adjusted_df["ticker"] == ticker) & (adjusted_df.index < split_date)
+            end = df.index.searchsorted(split_date, side="left")
+            mask = tickers[:end] == ticker
 
             if mask.any():
                 # --- Logique d'Ajustement ---
                 # Exemple : Split 1:10 (ratio = 10)
                 # 1. La quantité possédée est multipliée par le ratio
-                adjusted_df.loc[mask, "quantity"] *= ratio
+                quantities[:end][mask] *= ratio
 
                 # 2. Le prix de revient unitaire est divisé par le ratio
                 # Note : Le montant total (quantity * stock_price) reste constant
-                adjusted_df.loc[mask, "stock_price"] /= ratio
+                stock_prices[:end][mask] /= ratio
 
-        return adjusted_df
+        return df.assign(quantity=quantities, stock_price=stock_prices)
 
     # --- [ Gestion des Transactions ] ---
     def _insert_transactions_from_df(self, transactions_df: pd.DataFrame):
@@ -440,7 +459,8 @@ class TradeRepublicDatabase(Database):
         Utilise 'INSERT OR REPLACE' pour gérer les doublons sur le couple date/ticker.
 
         Args:
-            - df (pd.DataFrame) : DataFrame indexé par date avec les tickers en colonnes.
+            - df (pd.DataFrame | pd.Series) : DataFrame indexé par date avec les tickers en colonnes
+              (une Series est traitée comme une colonne unique portant son nom).
             - metric_type (str) : Type de métrique (ex: 'tickers_twr', 'tickers_gain').
             - portfolio_name (str) : Nom du portefeuille associé aux données.
         """
@@ -448,30 +468,27 @@ class TradeRepublicDatabase(Database):
         if df.empty:
             return
 
-        # Transformation du DataFrame : passage du format large au format long
-        # Logique : reset_index pour récupérer la date, puis melt pour pivoter les tickers
-        melted_df = (
-            df.reset_index()
-            .rename(columns={"index": "date"})
-            .melt(id_vars=["date"], var_name="ticker", value_name="value")
-        )
+        # Transformation du DataFrame : passage du format large au format long, colonne par colonne
+        # (même ordre que melt : toutes les dates du premier ticker, puis du suivant, etc.).
+        # Les dates ne sont formatées qu'une fois pour l'index, sans dictionnaire par ligne
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
 
-        # Ajout des métadonnées et formatage de la date pour SQLite
-        melted_df["metric_type"] = metric_type
-        melted_df["portfolio_name"] = portfolio_name
-        melted_df["date"] = melted_df["date"].dt.strftime("%Y-%m-%d")
+        n_dates, n_tickers = df.shape
+        dates = np.tile(df.index.strftime("%Y-%m-%d").to_numpy(), n_tickers).tolist()
+        tickers = np.repeat(df.columns.to_numpy(), n_dates).tolist()
+        values = df.to_numpy().ravel(order="F").tolist()
 
         # Requête SQL utilisant l'UPSERT (Gestion des conflits via la contrainte UNIQUE)
         query = """
             INSERT OR REPLACE INTO performances (date, ticker, metric_type, value, portfolio_name)
-            VALUES (:date, :ticker, :metric_type, :value, :portfolio_name)
+            VALUES (?, ?, ?, ?, ?)
         """
 
         try:
             with self._get_connection() as conn:
-                # Transformation en liste de dictionnaires pour une insertion groupée efficace
-                records = melted_df.to_dict(orient="records")
-                conn.executemany(query, records)
+                # Insertion groupée à partir des colonnes, les métadonnées étant constantes
+                conn.executemany(query, zip(dates, tickers, repeat(metric_type), values, repeat(portfolio_name)))
 
         except Exception as error:
             raise RuntimeError(
@@ -504,7 +521,7 @@ class TradeRepublicDatabase(Database):
         currencies_groups = self.__get_tickers_grouped_by_currency_company(list(df.columns))
 
         # Récupération des taux de change EURUSD (base Euro : 1 EUR = X USD)
-        fx_data = self.__get_stock_opening_prices("EURUSD=X")
+        fx_data = self.__get_fx_rates()
 
         if fx_data.empty:
             raise ValueError("Données de change indisponibles pour EURUSD=X dans la base.")
@@ -512,7 +529,8 @@ class TradeRepublicDatabase(Database):
         # On aligne les taux sur l'index du DF et on comble les trous (jours fériés)
         fx_series = fx_data["open_price"].reindex(df.index).ffill().bfill().astype(float)
 
-        converted_df = df.copy()
+        # Seules les colonnes converties sont recalculées, les autres sont reprises telles quelles
+        converted_columns = {}
 
         # Cas 1 : Conversion vers l'EUR
         if target_currency == "EUR":
@@ -520,7 +538,7 @@ class TradeRepublicDatabase(Database):
             usd_tickers = [t for t in df.columns if t in currencies_groups.get("USD", [])]
             if usd_tickers:
                 # Prix EUR = Prix USD / Taux (EUR/USD)
-                converted_df[usd_tickers] = converted_df[usd_tickers].div(fx_series, axis=0)
+                converted_columns = df[usd_tickers].div(fx_series, axis=0)
 
         # Cas 2 : Conversion vers l'USD
         elif target_currency == "USD":
@@ -528,9 +546,23 @@ class TradeRepublicDatabase(Database):
             eur_tickers = [t for t in df.columns if t in currencies_groups.get("EUR", [])]
             if eur_tickers:
                 # Prix USD = Prix EUR * Taux (EUR/USD)
-                converted_df[eur_tickers] = converted_df[eur_tickers].mul(fx_series, axis=0)
+                converted_columns = df[eur_tickers].mul(fx_series, axis=0)
+
+        return df.assign(**{column: converted_columns[column] for column in converted_columns})
 
-        return converted_df
+    def __get_fx_rates(self) -> pd.DataFrame:
+        """
+        Renvoie l'historique EURUSD=X, lu en base une seule fois puis réutilisé
+        par toutes les conversions (une par métrique et par devise).
+
+        Returns:
+            - pd.DataFrame : DataFrame avec 'date' en index et 'open_price' en colonne.
+        """
+
+        if self.__fx_rates_cache is None:
+            self.__fx_rates_cache = self.__get_stock_opening_prices("EURUSD=X")
+
+        return self.__fx_rates_cache
 
     def __get_tickers_grouped_by_currency_company(self, tickers: list[str]) -> dict[str, list[str]]:
         """
@@ -598,12 +630,13 @@ class TradeRepublicDatabase(Database):
             - int : L'identifiant (ID) de la ligne insérée, ou -1 si le fichier est un doublon.
         """
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Fichier introuvable : {file_path}")
-
         # Lecture binaire du fichier pour stockage en BLOB
-        with open(file_path, "rb") as file:
-            file_binary_data = file.read()
+        # L'ouverture directe signale l'absence du fichier sans appel système préalable
+        try:
+            with open(file_path, "rb") as file:
+                file_binary_data = file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Fichier introuvable : {file_path}")
 
         # Vérification de l'unicité via le contenu binaire (évite les doublons exacts)
         if self.__is_file_duplicated(file_binary_data):
@@ -693,7 +726,7 @@ class TradeRepublicDatabase(Database):
 
         try:
             with self.__get_connection() as conn:
-                raw_data = pd.read_sql_query(query, conn, parse_dates=["date"])
+                raw_data = pd.read_sql_query(query, conn, parse_dates={"date": {"format": "%Y-%m-%d"}})
 
             if raw_data.empty:
                 return pd.DataFrame()
@@ -771,12 +804,23 @@ class TradeRepublicDatabase(Database):
 
         query += " ORDER BY date ASC"
 
+        # Types déclarés pour éviter l'inférence à la lecture. Le type d'opération
+        # (quelques valeurs répétées sur toutes les lignes) est stocké en catégorie :
+        # les masques 'operation == ...' comparent alors des codes entiers
+        column_dtypes = {
+            "operation": "category",
+            "amount": "float64",
+            "fees": "float64",
+            "stock_price": "float64",
+            "quantity": "float64",
+        }
+
         try:
             with self.__get_connection() as conn:
-                df = pd.read_sql_query(query, conn, params=params)
+                df = pd.read_sql_query(query, conn, params=params, dtype=column_dtypes)
 
             if not df.empty:
-                df["date"] = pd.to_datetime(df["date"])
+                df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
                 df = df.set_index("date").sort_index()
 
             return self.__apply_splits(df)
@@ -848,7 +892,7 @@ class TradeRepublicDatabase(Database):
 
         try:
             with self.__get_connection() as conn:
-                raw_data = pd.read_sql_query(query, conn, params=params, parse_dates=["date"])
+                raw_data = pd.read_sql_query(query, conn, params=params, parse_dates={"date": {"format": "%Y-%m-%d"}})
 
             if not raw_data.empty:
                 # Pivotage des données pour aligner les tickers en colonnes
@@ -875,7 +919,9 @@ class TradeRepublicDatabase(Database):
 
         try:
             with self.__get_connection() as conn:
-                df = pd.read_sql_query(query_tx, conn, parse_dates=["date"])
+                df = pd.read_sql_query(
+                    query_tx, conn, parse_dates={"date": {"format": "%Y-%m-%d"}}, dtype={"operation": "category"}
+                )
 
             if df.empty:
                 return pd.DataFrame()
@@ -887,23 +933,22 @@ class TradeRepublicDatabase(Database):
             df[numeric_cols] = df[numeric_cols].astype(float)
 
             # Récupération des taux d'ouverture via la méthode interne
-            fx_df = self.__get_stock_opening_prices("EURUSD=X")
+            fx_df = self.__get_stock_opening_prices("EURUSD=X").dropna()
 
-            if fx_df.dropna().empty:
+            if fx_df.empty:
                 raise ValueError("Pas de données de change disponibles (EURUSD=X) dans la base.")
 
-            # Alignement des taux sur les dates des transactions (gestion week-ends/fériés)
-            fx_df = fx_df.reindex(df.index.unique()).ffill().bfill()
-
             # Identification des lignes nécessitant une conversion
             usd_mask = df["currency"] == "USD"
 
             if usd_mask.any():
-                rates = df.index.map(fx_df["EURUSD=X"])
+                # Alignement des taux sur les seules dates des transactions en USD
+                # (gestion week-ends/fériés) : le taux le plus proche est recherché
+                # en une seule passe, directement dans l'ordre des lignes
+                rates = fx_df["EURUSD=X"].reindex(df.index[usd_mask], method="nearest").to_numpy()
 
-                df.loc[usd_mask, "amount"] /= rates[usd_mask]
-                df.loc[usd_mask, "fees"] /= rates[usd_mask]
-                df.loc[usd_mask, "stock_price"] /= rates[usd_mask]
+                usd_cols = ["amount", "fees", "stock_price"]
+                df.loc[usd_mask, usd_cols] = df.loc[usd_mask, usd_cols].to_numpy() / rates[:, None]
 
                 df.loc[usd_mask, "currency"] = "EUR"
 
@@ -963,7 +1008,7 @@ class TradeRepublicDatabase(Database):
                 df = pd.read_sql_query(query, conn, params=[ticker])
 
                 if not df.empty:
-                    df["date"] = pd.to_datetime(df["date"])
+                    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
                     df = df.set_index("date")
                     df.index.name = "date"
 
@@ -1014,7 +1059,7 @@ class TradeRepublicDatabase(Database):
         try:
             with self.__get_connection() as conn:
                 # Chargement des données avec conversion automatique des dates
-                df = pd.read_sql_query(query, conn, parse_dates=["date"])
+                df = pd.read_sql_query(query, conn, parse_dates={"date": {"format": "%Y-%m-%d"}})
 
             return df
 
@@ -1062,6 +1107,6 @@ class TradeRepublicDatabase(Database):
             df = pd.read_sql_query(query, conn, params=params)
 
             if not df.empty:
-                df["date"] = pd.to_datetime(df["date"])
+                df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
 
             return df
@@ -1,3 +1,4 @@
+import concurrent.futures
 import json
 import os
 
@@ -15,15 +16,23 @@ class WealthDashboard:
     des rapports d'évolution et de répartition sous forme de graphiques.
     """
 
+    # Libellés affichés pour chaque compte, dans l'ordre des graphiques
+    ACCOUNT_NAMES = {"checking": "Compte Chèques", "livret_a": "Livret A", "trade_republic": "Trade Republic"}
+
     def __init__(self, bnp_checking_db_path: str, bnp_livret_a_db_path: str, trade_republic_db_path: str):
         self.__bnp_checking_db = BnpParibasDatabase(db_path=bnp_checking_db_path)
         self.__bnp_livret_a_db = BnpParibasDatabase(db_path=bnp_livret_a_db_path)
         self.__trade_republic_db = TradeRepublicDatabase(db_path=trade_republic_db_path)
+        # Opérations catégorisées par compte, lues une seule fois par rapport généré
+        self.__operations_cache = {}
 
     # --- [ Export ] ---
     def generate_wealth_report(self, export_path: str):
         """Génère un fichier HTML complet avec des graphiques plein écran et sélecteurs de dates."""
 
+        # Les bases ont pu être modifiées depuis le dernier rapport
+        self.__operations_cache.clear()
+
         # Récupération des données consolidées
         data_map = self.__get_normalized_data()
 
@@ -37,6 +46,8 @@ class WealthDashboard:
         liquidity_cfg = self.__get_liquidity_config(data_map)
         fire_gauge = self.__get_fire_gauge_config(data_map)
 
+        # highstock.js (sur-ensemble de Highcharts) est nécessaire au sélecteur de période
+        # (rangeSelector) du graphique global ; il fournit aussi le dataGrouping des courbes
         js_files = ["src/static/js/highstock.js", "src/static/js/highcharts-more.js", "src/static/js/solid-gauge.js"]
         js_content = ""
 
@@ -106,8 +117,12 @@ class WealthDashboard:
             - dict : Configuration Highcharts.
         """
 
-        total_series = data_map["checking"] + data_map["livret_a"] + data_map["trade_republic"]
-        chart_data = [[int(date.timestamp() * 1000), round(val, 2)] for date, val in total_series.items()]
+        total_series = data_map["total"]
+
+        # Index quotidien régulier : seules les valeurs sont transmises, les dates sont
+        # reconstruites par Highcharts à partir de pointStart et pointInterval
+        point_start = int(total_series.index[0].timestamp() * 1000) if not total_series.empty else 0
+        chart_data = [round(val, 2) for val in total_series.tolist()]
 
         return {
             "rangeSelector": {
@@ -127,12 +142,20 @@ class WealthDashboard:
             "title": {"text": "Évolution du Patrimoine Global"},
             "xAxis": {"type": "datetime", "ordinal": False},
             "yAxis": {"title": {"text": "Total (€)"}, "opposite": False, "startOnTick": False, "endOnTick": False},
-            "plotOptions": {"area": {"threshold": None, "enableMouseTracking": True}},
+            "plotOptions": {
+                "area": {"threshold": None, "enableMouseTracking": True},
+                # Regroupement côté navigateur : un point par groupe de 2 pixels, quelle
+                # que soit la longueur de l'historique quotidien. Chaque groupe affiche le solde
+                # de fin de période ('close') : le dernier point reste égal au patrimoine actuel
+                "series": {"dataGrouping": {"enabled": True, "approximation": "close", "groupPixelWidth": 2}},
+            },
             "tooltip": {"valueSuffix": " €"},
             "series": [
                 {
                     "name": "Patrimoine Total",
                     "data": chart_data,
+                    "pointStart": point_start,
+                    "pointInterval": 24 * 3600 * 1000,
                     "color": "#00E272",
                     "fillOpacity": 0.3,
                     "tooltip": {"valueDecimals": 2},
@@ -152,23 +175,18 @@ class WealthDashboard:
         """
 
         series = []
-        names = {"checking": "Compte Chèques", "livret_a": "Livret A", "trade_republic": "Trade Republic"}
-
-        for key, name in names.items():
-            items = list(data_map[key].items())
-            n = len(items)
-            formatted_data = []
+        for key, name in self.ACCOUNT_NAMES.items():
+            values = data_map[key].to_numpy(dtype=float)
 
-            for i in range(n):
-                d, v = items[i]
-                # Logique pour garder les points actifs ou entourés d'activité
-                is_active = v != 0
-                has_prev_active = i > 0 and items[i - 1][1] != 0
-                has_next_active = i < n - 1 and items[i + 1][1] != 0
+            # Logique pour garder les points actifs ou entourés d'activité,
+            # évaluée en une fois sur tout le tableau
+            is_active = values != 0
+            keep = is_active.copy()
+            keep[1:] |= is_active[:-1]
+            keep[:-1] |= is_active[1:]
 
-                if is_active or has_prev_active or has_next_active:
-                    timestamp = int(d.timestamp() * 1000)
-                    formatted_data.append([timestamp, round(v, 2)])
+            timestamps = data_map[key].index[keep].astype("datetime64[ms]").astype("int64").tolist()
+            formatted_data = [[timestamp, round(v, 2)] for timestamp, v in zip(timestamps, values[keep].tolist())]
 
             if formatted_data:
                 series.append(
@@ -196,6 +214,10 @@ class WealthDashboard:
                 "itemStyle": {"fontSize": "14px", "cursor": "pointer"},
             },
             "tooltip": {"shared": False, "valueSuffix": " €", "split": True},
+            "plotOptions": {
+                # Soldes de fin de période ('close') plutôt qu'une moyenne jamais atteinte
+                "series": {"dataGrouping": {"enabled": True, "approximation": "close", "groupPixelWidth": 2}}
+            },
             "series": series,
         }
 
@@ -211,10 +233,8 @@ class WealthDashboard:
         """
 
         pie_data = []
-        names = {"checking": "Compte Chèques", "livret_a": "Livret A", "trade_republic": "Trade Republic"}
-
-        for key, name in names.items():
-            last_val = round(data_map[key].iloc[-1], 2)
+        for key, name in self.ACCOUNT_NAMES.items():
+            last_val = round(data_map["latest"][key], 2)
             pie_data.append({"name": name, "y": last_val})
 
         return {
@@ -238,9 +258,10 @@ class WealthDashboard:
             - dict : Configuration Highcharts.
         """
 
-        cash = round(data_map["checking"].iloc[-1], 2)
-        precaution = round(data_map["livret_a"].iloc[-1], 2)
-        invest = round(data_map["trade_republic"].iloc[-1], 2)
+        latest = data_map["latest"]
+        cash = round(latest["checking"], 2)
+        precaution = round(latest["livret_a"], 2)
+        invest = round(latest["trade_republic"], 2)
 
         return {
             "chart": {"type": "bar", "height": 300},
@@ -274,10 +295,8 @@ class WealthDashboard:
             - dict : Configuration Highcharts (Gauge) avec sous-titre détaillé.
         """
 
-        # Calcul du patrimoine total actuel (somme des derniers points de chaque série)
-        total_wealth = (
-            data_map["checking"].iloc[-1] + data_map["livret_a"].iloc[-1] + data_map["trade_republic"].iloc[-1]
-        )
+        # Patrimoine total actuel (dernier point de la série totale)
+        total_wealth = data_map["latest"]["total"]
 
         # Récupération de la moyenne des dépenses et calcul de l'objectif (x25)
         avg_monthly = self.__average_monthly_expenses()
@@ -287,10 +306,6 @@ class WealthDashboard:
         remaining_amount = max(0, fire_objective - total_wealth)
         score_pct = min(round((total_wealth / fire_objective) * 100, 1), 100)
 
-        # Fonction interne pour le formatage des montants (ex: 12 345)
-        def f_num(n):
-            return f"{int(n):,}".replace(",", " ")
-
         return {
             "chart": {
                 "type": "solidgauge",
@@ -302,9 +317,9 @@ class WealthDashboard:
                 # Ajout du patrimoine actuel dans le bloc informatif sous le graphique
                 "text": (
                     f"<div style='text-align: center; color: #666; font-size: 14px; margin-top: 10px; line-height: 1.6;'>"
-                    f"Moyenne des dépenses : <b>{f_num(avg_monthly)}€ / mois</b><br/>"
-                    f"Objectif de liberté financière (FIRE) : <b>{f_num(fire_objective)}€</b><br/>"
-                    f"Montant restant à gagner : <b>{f_num(remaining_amount)}€</b>"
+                    f"Moyenne des dépenses : <b>{self.__format_amount(avg_monthly)}€ / mois</b><br/>"
+                    f"Objectif de liberté financière (FIRE) : <b>{self.__format_amount(fire_objective)}€</b><br/>"
+                    f"Montant restant à gagner : <b>{self.__format_amount(remaining_amount)}€</b>"
                     f"</div>"
                 ),
                 "useHTML": True,
@@ -366,46 +381,57 @@ class WealthDashboard:
         maximum_checking_amount = 200
         alerts = []
 
-        def f_num(n):
-            return f"{int(n):,}".replace(",", " ")
-
         # Analyse épargne de précaution
-        precaution_balance = data_map["livret_a"].iloc[-1]
+        precaution_balance = data_map["latest"]["livret_a"]
         if precaution_balance < minimum_livret_a_amount:
             alerts.append(
-                f'<div class="alert danger"><strong>⚠️ Alerte Épargne de Précaution :</strong> Ton Livret A est à {f_num(precaution_balance)}€. Seuil recommandé : {f_num(minimum_livret_a_amount)}€.</div>'
+                f'<div class="alert danger"><strong>⚠️ Alerte Épargne de Précaution :</strong> Ton Livret A est à {self.__format_amount(precaution_balance)}€. Seuil recommandé : {self.__format_amount(minimum_livret_a_amount)}€.</div>'
             )
 
         # Analyse compte chèques
-        checking_balance = data_map["checking"].iloc[-1]
+        checking_balance = data_map["latest"]["checking"]
         if checking_balance < minimum_checking_amount:
             alerts.append(
-                f'<div class="alert danger"><strong>⚠️ Solde Compte Chèques Bas :</strong> Attention, il ne reste que {f_num(checking_balance)}€.</div>'
+                f'<div class="alert danger"><strong>⚠️ Solde Compte Chèques Bas :</strong> Attention, il ne reste que {self.__format_amount(checking_balance)}€.</div>'
             )
         elif checking_balance > maximum_checking_amount:
             alerts.append(
-                f'<div class="alert danger"><strong>⚠️ Solde Compte Chèques Haut :</strong> Trop d\'argent dort sur le compte ({f_num(checking_balance)}€).</div>'
+                f'<div class="alert danger"><strong>⚠️ Solde Compte Chèques Haut :</strong> Trop d\'argent dort sur le compte ({self.__format_amount(checking_balance)}€).</div>'
             )
 
         return "".join(alerts)
 
     # --- [ Traitement des Données ] ---
+    @staticmethod
+    def __format_amount(n: float) -> str:
+        """Formate un montant entier avec des espaces comme séparateurs de milliers (ex: 12 345)"""
+        return f"{int(n):,}".replace(",", " ")
+
     def __get_normalized_data(self) -> dict:
         """
         Prépare et aligne les données de tous les comptes sur une échelle de temps commune.
 
         Returns:
-            - dict : Dictionnaire de pd.Series indexées par date.
+            - dict : Dictionnaire de pd.Series indexées par date (une par compte, plus 'total'),
+                     et 'latest' : dictionnaire des soldes à la dernière date.
         """
 
+        # Lecture concurrente des trois bases : chaque appel ouvre sa propre
+        # connexion SQLite sur un fichier distinct, les lectures sont indépendantes
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            future_c = executor.submit(self.__get_categorized_operations, "checking")
+            future_s = executor.submit(self.__get_categorized_operations, "livret_a")
+            future_tr = executor.submit(
+                self.__trade_republic_db._get_performance_data,
+                "Mes Portefeuilles", "Mes Portefeuilles", "portfolio_valuation"
+            )
+
         # On récupère les DataFrames (qui contiennent déjà operation_date en datetime)
-        df_c = self.__bnp_checking_db._get_operations("categorized_operations")
-        df_s = self.__bnp_livret_a_db._get_operations("categorized_operations")
+        df_c = future_c.result()
+        df_s = future_s.result()
 
         # Pour Trade Republic, on garde ta logique spécifique
-        df_tr = self.__trade_republic_db._get_performance_data(
-            "Mes Portefeuilles", "Mes Portefeuilles", "portfolio_valuation"
-        ).rename(columns={"value": "amount", "operation_date": "date"})
+        df_tr = future_tr.result().rename(columns={"value": "amount", "operation_date": "date"})
 
         # Uniformisation des noms de colonnes pour la date
         df_c = df_c.rename(columns={"operation_date": "date"})
@@ -415,26 +441,60 @@ class WealthDashboard:
         for df in [df_c, df_s, df_tr]:
             df["date"] = pd.to_datetime(df["date"])
 
-        # Création de la plage temporelle
-        all_dates = pd.concat([df_c["date"], df_s["date"], df_tr["date"]])
-        full_range = pd.date_range(start=all_dates.min(), end=all_dates.max(), freq="D")
-
-        # Sommation cumulée
-        checking = df_c.groupby("date")["amount"].sum().reindex(full_range, fill_value=0).cumsum()
-        livret_a = df_s.groupby("date")["amount"].sum().reindex(full_range, fill_value=0).cumsum()
+        # Création de la plage temporelle à partir des bornes de chaque source,
+        # sans concaténer les trois colonnes de dates
+        sources_dates = [df["date"] for df in (df_c, df_s, df_tr) if not df.empty]
+        start = min(dates.min() for dates in sources_dates)
+        end = max(dates.max() for dates in sources_dates)
+        full_range = pd.date_range(start=start, end=end, freq="D")
+
+        # Sommation cumulée des deux comptes BNP en une seule matrice (une réindexation, un cumul)
+        balances = pd.concat(
+            {
+                "checking": df_c.groupby("date")["amount"].sum(),
+                "livret_a": df_s.groupby("date")["amount"].sum(),
+            },
+            axis=1,
+            sort=False,
+        ).reindex(full_range).fillna(0.0).cumsum()
 
         # Propagation Trade Republic
         tr_raw = df_tr.groupby("date")["amount"].sum().reindex(full_range)
-        trade_republic = tr_raw.ffill().fillna(0)
+        balances["trade_republic"] = tr_raw.ffill().fillna(0)
+
+        # Le patrimoine total est calculé une fois ici, pour tous les graphiques
+        data_map = {column: balances[column] for column in balances.columns}
+        data_map["total"] = balances.sum(axis=1)
+
+        # Soldes à la dernière date, extraits en une seule lecture de ligne
+        latest = balances.iloc[-1].to_dict()
+        latest["total"] = float(data_map["total"].iloc[-1])
+        data_map["latest"] = latest
+        return data_map
+
+    def __get_categorized_operations(self, account: str) -> pd.DataFrame:
+        """
+        Renvoie les opérations catégorisées d'un compte BNP, lues une seule fois par rapport.
+
+        Args:
+            - account (str) : 'checking' ou 'livret_a'.
+
+        Returns:
+            - pd.DataFrame : Opérations catégorisées du compte (à ne pas modifier en place).
+        """
+
+        if account not in self.__operations_cache:
+            db = self.__bnp_checking_db if account == "checking" else self.__bnp_livret_a_db
+            self.__operations_cache[account] = db._get_operations("categorized_operations")
 
-        return {"checking": checking, "livret_a": livret_a, "trade_republic": trade_republic}
+        return self.__operations_cache[account]
 
     def __average_monthly_expenses(self) -> float:
         """Calcule la moyenne des dépenses mensuelles sur les 12 derniers mois"""
 
-        # Fusion des sources
-        df_checking = self.__bnp_checking_db._get_operations("categorized_operations")
-        df_livret_a = self.__bnp_livret_a_db._get_operations("categorized_operations")
+        # Fusion des sources (déjà chargées par __get_normalized_data)
+        df_checking = self.__get_categorized_operations("checking")
+        df_livret_a = self.__get_categorized_operations("livret_a")
         df_all = pd.concat([df_checking, df_livret_a], ignore_index=True)
 
         df_all["operation_date"] = pd.to_datetime(df_all["operation_date"])
@@ -442,13 +502,13 @@ class WealthDashboard:
         # Filtrage sur les 12 derniers mois
         last_date = df_all["operation_date"].max()
         start_date = last_date - pd.DateOffset(months=12)
-        df_all = df_all[df_all["operation_date"] >= start_date].copy()
+        df_all = df_all[df_all["operation_date"] >= start_date]
 
         # Exclusion des transferts vers l'épargne/investissement
         exclude_names = ["Épargne", "Investissement"]
 
         # Filtrage des dépenses réelles
-        df_expenses = df_all[(df_all["amount"] < 0) & (~df_all["category_name"].isin(exclude_names))].copy()
+        df_expenses = df_all[(df_all["amount"] < 0) & (~df_all["category_name"].isin(exclude_names))]
 
         # Agrégation mensuelle
         monthly_totals = df_expenses.groupby(df_expenses["operation_date"].dt.to_period("M"))["amount"].sum().abs()